@@ -0,0 +1,131 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""Optional C implementation of the FilterAgent column extraction and filter kernel.
+
+Build in place with ``python setup.py build_ext --inplace``. When the compiled
+module is not importable, FilterAgent falls back to ``_to_soa`` plus
+``agents._filter_kernels.evaluate`` with identical results.
+"""
+import numpy as np
+cimport numpy as cnp
+from cpython.dict cimport PyDict_GetItemString
+from cpython.list cimport PyList_GET_SIZE, PyList_GET_ITEM
+from cpython.ref cimport PyObject
+from libc.math cimport NAN, isnan
+
+cnp.import_array()
+
+# Column names, frozen as bytes for PyDict_GetItemString
+cdef const char* _OPEN = b"open_price"
+cdef const char* _LTP = b"ltp"
+cdef const char* _PREV_CLOSE = b"prev_close"
+cdef const char* _PREV_HIGH = b"prev_day_high"
+cdef const char* _VOLUME = b"volume"
+cdef const char* _TOTAL_OI = b"total_oi"
+
+
+cdef inline double _get(dict stock, const char* key) except? -1.0:
+    """stock.get(key, 0) as a double, or NaN when the value is None or cannot be converted"""
+    cdef PyObject* item = PyDict_GetItemString(stock, key)
+    if item is NULL:
+        return 0.0
+    value = <object>item
+    if type(value) is float:
+        return <double>value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return NAN
+
+
+def filter_batch(list stocks, double min_pct):
+    """Extract filter columns and evaluate predicates and scores in one pass.
+
+    Returns ``(cols, (mask, prev_high, pct_change, gap_up, score))`` in the same
+    shape as ``FilterAgent._to_soa`` and ``_filter_kernels.evaluate``.
+    """
+    cdef Py_ssize_t n = PyList_GET_SIZE(stocks)
+    cdef Py_ssize_t i
+    cdef dict stock
+    cdef double o, l, pc, pdh, v, oi, g, p
+    cdef int s
+
+    open_arr = np.empty(n, dtype=np.float64)
+    ltp_arr = np.empty(n, dtype=np.float64)
+    prev_close_arr = np.empty(n, dtype=np.float64)
+    prev_day_high_arr = np.empty(n, dtype=np.float64)
+    volume_arr = np.empty(n, dtype=np.float64)
+    oi_arr = np.empty(n, dtype=np.float64)
+    mask_arr = np.zeros(n, dtype=np.bool_)
+    prev_high_arr = np.empty(n, dtype=np.float64)
+    pct_arr = np.empty(n, dtype=np.float64)
+    gap_arr = np.empty(n, dtype=np.float64)
+    score_arr = np.empty(n, dtype=np.int32)
+
+    cdef double[::1] open_ = open_arr
+    cdef double[::1] ltp = ltp_arr
+    cdef double[::1] prev_close = prev_close_arr
+    cdef double[::1] prev_day_high = prev_day_high_arr
+    cdef double[::1] volume = volume_arr
+    cdef double[::1] total_oi = oi_arr
+    cdef cnp.uint8_t[::1] mask = mask_arr.view(np.uint8)
+    cdef double[::1] prev_high = prev_high_arr
+    cdef double[::1] pct_change = pct_arr
+    cdef double[::1] gap_up = gap_arr
+    cdef int[::1] score = score_arr
+
+    for i in range(n):
+        row = <object>PyList_GET_ITEM(stocks, i)
+        if not isinstance(row, dict):
+            raise TypeError(f"stock rows must be dicts, not {type(row).__name__}")
+        stock = <dict>row
+        o = _get(stock, _OPEN)
+        l = _get(stock, _LTP)
+        pc = _get(stock, _PREV_CLOSE)
+        pdh = _get(stock, _PREV_HIGH)
+        v = _get(stock, _VOLUME)
+        oi = _get(stock, _TOTAL_OI)
+
+        open_[i] = o
+        ltp[i] = l
+        prev_close[i] = pc
+        prev_day_high[i] = pdh
+        volume[i] = v
+        total_oi[i] = oi
+
+        # NaN marks an unparseable value and never passes; only a numeric non-positive high falls back
+        if pdh <= 0:
+            pdh = pc
+        prev_high[i] = pdh
+
+        g = (o - pdh) / pdh * 100 if pdh > 0 else 0.0
+        p = (l - pc) / pc * 100 if pc > 0 else 0.0
+        gap_up[i] = g
+        pct_change[i] = p
+
+        mask[i] = (not isnan(pdh) and not isnan(v) and pdh > 0 and pc > 0 and o > pdh and p >= min_pct and
+                   v > 1000 and 10 <= l <= 50000 and
+                   0.1 <= g <= 25 and -50 <= p <= 100)
+
+        # Same integer tiers as _filter_kernels._evaluate_loop
+        s = <int>min(g * 2, 40.0) + <int>min(p * 2, 40.0)
+        if v > 100000:
+            s += 10
+        elif v > 50000:
+            s += 7
+        elif v > 10000:
+            s += 5
+        elif v > 1000:
+            s += 2
+        if oi > 0:
+            s += 10
+        score[i] = s
+
+    cols = {
+        'open_price': open_arr,
+        'ltp': ltp_arr,
+        'prev_close': prev_close_arr,
+        'prev_day_high': prev_day_high_arr,
+        'volume': volume_arr,
+        'total_oi': oi_arr,
+    }
+    return cols, (mask_arr, prev_high_arr, pct_arr, gap_arr, score_arr)
@@ -0,0 +1,97 @@
+"""Numeric kernels for FilterAgent.filter_stocks, JIT-compiled with numba when it is installed"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # optional dependency
+    njit = None
+    prange = range
+
+# Filter score volume tiers: _VOL_POINTS[k] for volume above _VOL_BINS[k - 1] (strictly)
+_VOL_BINS = np.array([1000, 10000, 50000, 100000], dtype=np.float64)
+_VOL_POINTS = np.array([0, 2, 5, 7, 10], dtype=np.int32)
+
+# Below this many rows the thread fan-out of the parallel kernel costs more than it saves
+_PARALLEL_MIN_ROWS = 20000
+
+
+def _evaluate_loop(open_price, ltp, prev_close, prev_day_high, volume, total_oi, min_pct):
+    """Single pass over the columns: fallback, ratios, all filter predicates and the filter score"""
+    n = open_price.shape[0]
+    mask = np.zeros(n, dtype=np.uint8)
+    prev_high = np.empty(n, dtype=np.float64)
+    pct_change = np.empty(n, dtype=np.float64)
+    gap_up = np.empty(n, dtype=np.float64)
+    score = np.empty(n, dtype=np.int32)
+
+    # Rows are independent and each writes only its own slots, so prange can split them across threads
+    for i in prange(n):
+        pc = prev_close[i]
+        pdh = prev_day_high[i]
+        # NaN marks an unparseable value and never passes; only a numeric non-positive high falls back
+        if pdh <= 0:
+            pdh = pc
+        prev_high[i] = pdh
+
+        g = (open_price[i] - pdh) / pdh * 100 if pdh > 0 else 0.0
+        p = (ltp[i] - pc) / pc * 100 if pc > 0 else 0.0
+        gap_up[i] = g
+        pct_change[i] = p
+
+        # Branchless conjunction so the comparisons vectorize instead of short-circuiting
+        mask[i] = ((not np.isnan(pdh)) & (not np.isnan(volume[i])) &
+                   (pdh > 0) & (pc > 0) & (open_price[i] > pdh) & (p >= min_pct) &
+                   (volume[i] > 1000) & (ltp[i] >= 10) & (ltp[i] <= 50000) &
+                   (g >= 0.1) & (g <= 25) & (p >= -50) & (p <= 100))
+
+        # Integer filter score (0-100): gap up and momentum 0-40 each, volume tier 0-10, OI 10
+        s = int(min(g * 2, 40.0)) + int(min(p * 2, 40.0))
+        v = volume[i]
+        if v > 100000:
+            s += 10
+        elif v > 50000:
+            s += 7
+        elif v > 10000:
+            s += 5
+        elif v > 1000:
+            s += 2
+        if total_oi[i] > 0:
+            s += 10
+        score[i] = s
+
+    return mask.view(np.bool_), prev_high, pct_change, gap_up, score
+
+
+def _evaluate_numpy(open_price, ltp, prev_close, prev_day_high, volume, total_oi, min_pct):
+    """Vectorized NumPy equivalent of _evaluate_loop"""
+    prev_high = np.where(prev_day_high <= 0, prev_close, prev_day_high)
+
+    # Divide by 1.0 where the guard fails so no inf/nan is produced just to be discarded by np.where
+    has_prev_high = prev_high > 0
+    has_prev_close = prev_close > 0
+    gap_up = np.where(has_prev_high, (open_price - prev_high) / np.where(has_prev_high, prev_high, 1.0) * 100, 0.0)
+    pct_change = np.where(has_prev_close, (ltp - prev_close) / np.where(has_prev_close, prev_close, 1.0) * 100, 0.0)
+
+    mask = (~np.isnan(prev_high) & ~np.isnan(volume) &
+            has_prev_high & has_prev_close & (open_price > prev_high) & (pct_change >= min_pct) &
+            (volume > 1000) & (ltp >= 10) & (ltp <= 50000) &
+            (gap_up >= 0.1) & (gap_up <= 25) & (pct_change >= -50) & (pct_change <= 100))
+
+    volume_points = _VOL_POINTS[np.searchsorted(_VOL_BINS, np.nan_to_num(volume, nan=0.0), side='left')]
+    score = (np.trunc(np.minimum(gap_up * 2, 40.0)).astype(np.int32) +
+             np.trunc(np.minimum(pct_change * 2, 40.0)).astype(np.int32) +
+             volume_points + np.where(total_oi > 0, 10, 0).astype(np.int32))
+
+    return mask, prev_high, pct_change, gap_up, score
+
+
+if njit is not None:
+    _evaluate_serial = njit(cache=True, boundscheck=False)(_evaluate_loop)
+    _evaluate_parallel = njit(cache=True, boundscheck=False, parallel=True)(_evaluate_loop)
+
+    def evaluate(open_price, ltp, prev_close, prev_day_high, volume, total_oi, min_pct):
+        """Run the JIT kernel, multi-threaded for large batches"""
+        kernel = _evaluate_parallel if open_price.shape[0] >= _PARALLEL_MIN_ROWS else _evaluate_serial
+        return kernel(open_price, ltp, prev_close, prev_day_high, volume, total_oi, min_pct)
+else:
+    evaluate = _evaluate_numpy
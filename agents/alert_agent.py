@@ -1,25 +1,146 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import asyncio
+import heapq
 import logging
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from datetime import datetime
 from config.settings import settings
 
+try:
+    import orjson
+except ImportError:  # optional fast JSON encoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Telegram allows roughly one message per second into a single chat
+TELEGRAM_CHAT_INTERVAL = 1.05
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Summary alert layout
+SUMMARY_STOCK_LIMIT = 10
+DETAILED_STOCK_LIMIT = 5
+
+# Message templates, compiled once at import
+_STOCK_ALERT_TMPL = (
+    "🔔 <b>STOCK ALERT</b>\n"
+    "            \n"
+    "📈 <b>{symbol}</b>\n"
+    "💰 Open: ₹{open_price:.2f} | LTP: ₹{ltp:.2f}\n"
+    "📊 Prev Close: ₹{prev_close:.2f} | PDH: ₹{prev_day_high:.2f}\n"
+    "🚀 Change: <b>+{percentage_change:.2f}%</b>\n"
+    "📦 Volume: {volume}\n"
+    "🔗 Source: {source}\n"
+    "\n"
+    "⏰ {ts}"
+).format
+_SUMMARY_HEADER_TMPL = (
+    "🔍 <b>STOCK SCAN RESULTS</b>\n"
+    "📅 {ts}\n"
+    "\n"
+    "🎯 <b>{count} stocks found!</b>\n"
+    "\n"
+).format
+_STOCK_ROW_TMPL = (
+    "{i}. <b>{symbol}</b>\n"
+    "   Open: ₹{open_price:.2f} → LTP: ₹{ltp:.2f}\n"
+    "   🚀 <b>+{percentage_change:.2f}%</b>\n\n"
+).format
+_STOCK_DETAIL_TMPL = (
+    "{i}. <b>{symbol}</b>\n"
+    "   💰 Open: ₹{open_price:.2f} | LTP: ₹{ltp:.2f}\n"
+    "   📊 Prev Close: ₹{prev_close:.2f} | PDH: ₹{prev_day_high:.2f}\n"
+    "   🚀 Change: <b>+{percentage_change:.2f}%</b>\n"
+    "   📦 Volume: {volume} | 🔗 {source}\n\n"
+).format
+_MORE_STOCKS_TMPL = "... and {count} more stocks\n\n".format
+_CRITERIA_TMPL = (
+    "📋 <b>Criteria:</b>\n"
+    "• Open > Previous Day High\n"
+    "• Change ≥ {min_pct}%\n"
+).format
+
+
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    """Serialize a Telegram payload, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+
+def _percentage_change(stock: Dict[str, Any]) -> float:
+    """Ranking key for alerts"""
+    return stock.get('percentage_change', 0)
+
+
+class _AsyncRateLimiter:
+    """Spaces out message submissions without blocking the event loop"""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+    
+    async def wait(self):
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next_slot - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_slot = loop.time() + self.interval
+
+
 class AlertAgent:
     """Agent responsible for sending Telegram alerts"""
     
     def __init__(self):
         self.bot_token = settings.TELEGRAM_BOT_TOKEN
         self.chat_id = settings.TELEGRAM_CHAT_ID
-        self.telegram_api_url = f"https://api.telegram.org/bot{self.bot_token}"
+        
+        # Clean up credentials once - the send URL and payload skeleton never change
+        self._bot_token = self.bot_token.strip() if self.bot_token else ""
+        self._chat_id = self.chat_id.strip() if self.chat_id else ""
+        self._send_url = f"https://api.telegram.org/bot{self._bot_token}/sendMessage"
+        self._base_payload = {
+            'chat_id': self._chat_id,
+            'parse_mode': 'HTML',
+            'disable_web_page_preview': True
+        }
+        
+        # Persistent session so consecutive alerts reuse the same TLS connection
+        self.session = requests.Session()
+        self.session.headers.update({'Connection': 'keep-alive'})
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
         
         if not self.bot_token or not self.chat_id:
             logger.warning("Telegram credentials not configured properly")
         
         logger.info("AlertAgent initialized")
     
+    def close(self):
+        """Close the underlying HTTP session"""
+        session = getattr(self, 'session', None)
+        if session is not None:
+            session.close()
+            self.session = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
     def send_telegram_message(self, message: str) -> bool:
         """Send a message to Telegram"""
         try:
@@ -27,20 +148,9 @@ class AlertAgent:
                 logger.error("Telegram credentials not configured")
                 return False
             
-            # Clean up the bot token - remove any extra characters
-            clean_bot_token = self.bot_token.strip()
-            clean_chat_id = self.chat_id.strip()
+            payload = {**self._base_payload, 'text': message}
             
-            url = f"https://api.telegram.org/bot{clean_bot_token}/sendMessage"
-            
-            payload = {
-                'chat_id': clean_chat_id,
-                'text': message,
-                'parse_mode': 'HTML',
-                'disable_web_page_preview': True
-            }
-            
-            response = requests.post(url, json=payload, timeout=10)
+            response = self.session.post(self._send_url, data=_dumps(payload), headers=_JSON_HEADERS, timeout=10)
             
             if response.status_code == 200:
                 result = response.json()
@@ -48,101 +158,144 @@ class AlertAgent:
                     logger.info("Telegram message sent successfully")
                     return True
                 else:
-                    logger.error(f"Telegram API error: {result.get('description', 'Unknown error')}")
+                    logger.error("Telegram API error: %s", result.get('description', 'Unknown error'))
                     return False
             else:
-                logger.error(f"Telegram HTTP error {response.status_code}: {response.text}")
+                logger.error("Telegram HTTP error %d: %s", response.status_code, response.text)
                 return False
                 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error sending Telegram message: {e}")
+            logger.error("Error sending Telegram message: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error sending Telegram message: {e}")
+            logger.error("Unexpected error sending Telegram message: %s", e)
             return False
     
-    def format_stock_alert(self, stock: Dict[str, Any]) -> str:
+    def _format_volume(self, volume: int) -> str:
+        """Format volume in crore/lakh units"""
+        if volume > 10000000:  # 1 crore
+            return f"{volume/10000000:.1f}Cr"
+        elif volume > 100000:  # 1 lakh
+            return f"{volume/100000:.1f}L"
+        return f"{volume:,}"
+    
+    def format_stock_alert(self, stock: Dict[str, Any], ts: Optional[str] = None) -> str:
         """Format a single stock alert message"""
         try:
-            symbol = stock.get('symbol', 'N/A')
-            open_price = stock.get('open_price', 0)
-            ltp = stock.get('ltp', 0)
-            prev_close = stock.get('prev_close', 0)
-            prev_day_high = stock.get('prev_day_high', 0)
-            percentage_change = stock.get('percentage_change', 0)
-            volume = stock.get('volume', 0)
-            source = stock.get('source', 'Unknown')
-            
-            # Format volume
-            if volume > 10000000:  # 1 crore
-                volume_str = f"{volume/10000000:.1f}Cr"
-            elif volume > 100000:  # 1 lakh
-                volume_str = f"{volume/100000:.1f}L"
-            else:
-                volume_str = f"{volume:,}"
-            
-            alert_message = f"""🔔 <b>STOCK ALERT</b>
-            
-📈 <b>{symbol}</b>
-💰 Open: ₹{open_price:.2f} | LTP: ₹{ltp:.2f}
-📊 Prev Close: ₹{prev_close:.2f} | PDH: ₹{prev_day_high:.2f}
-🚀 Change: <b>+{percentage_change:.2f}%</b>
-📦 Volume: {volume_str}
-🔗 Source: {source}
-
-⏰ {datetime.now().strftime('%H:%M:%S')}"""
-            
-            return alert_message
+            return _STOCK_ALERT_TMPL(
+                symbol=stock.get('symbol', 'N/A'),
+                open_price=stock.get('open_price', 0),
+                ltp=stock.get('ltp', 0),
+                prev_close=stock.get('prev_close', 0),
+                prev_day_high=stock.get('prev_day_high', 0),
+                percentage_change=stock.get('percentage_change', 0),
+                volume=self._format_volume(stock.get('volume', 0)),
+                source=stock.get('source', 'Unknown'),
+                ts=ts or datetime.now().strftime('%H:%M:%S')
+            )
             
         except Exception as e:
-            logger.error(f"Error formatting stock alert: {e}")
+            logger.error("Error formatting stock alert: %s", e)
             return f"🔔 STOCK ALERT\n📈 {stock.get('symbol', 'N/A')}\n❌ Error formatting data"
     
-    def format_summary_alert(self, filtered_stocks: List[Dict[str, Any]]) -> str:
-        """Format a summary alert with all filtered stocks"""
+    def _build_summary_blocks(self, filtered_stocks: List[Dict[str, Any]], detailed: bool = False,
+                              ts: Optional[str] = None) -> List[str]:
+        """Build the summary alert as header, one block per stock, and footer"""
         try:
             if not filtered_stocks:
-                return "🔍 <b>STOCK SCAN COMPLETE</b>\n\n❌ No stocks found matching the criteria.\n\n⏰ " + datetime.now().strftime('%H:%M:%S')
+                return ["🔍 <b>STOCK SCAN COMPLETE</b>\n\n❌ No stocks found matching the criteria.\n\n⏰ " + (ts or datetime.now().strftime('%H:%M:%S'))]
             
             # Header
-            summary = f"""🔍 <b>STOCK SCAN RESULTS</b>
-📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-🎯 <b>{len(filtered_stocks)} stocks found!</b>
-
-"""
+            blocks = [_SUMMARY_HEADER_TMPL(ts=ts or datetime.now().strftime('%Y-%m-%d %H:%M:%S'), count=len(filtered_stocks))]
             
-            # Sort stocks by percentage change (descending)
-            sorted_stocks = sorted(filtered_stocks, key=lambda x: x.get('percentage_change', 0), reverse=True)
+            # Top stocks by percentage change (descending)
+            top_stocks = heapq.nlargest(SUMMARY_STOCK_LIMIT, filtered_stocks, key=_percentage_change)
             
-            # Add each stock
-            for i, stock in enumerate(sorted_stocks[:10], 1):  # Limit to top 10
-                symbol = stock.get('symbol', 'N/A')
-                ltp = stock.get('ltp', 0)
-                open_price = stock.get('open_price', 0)
-                percentage_change = stock.get('percentage_change', 0)
-                
-                summary += f"{i}. <b>{symbol}</b>\n"
-                summary += f"   Open: ₹{open_price:.2f} → LTP: ₹{ltp:.2f}\n"
-                summary += f"   🚀 <b>+{percentage_change:.2f}%</b>\n\n"
+            # Add each stock, with full details for the top performers when requested
+            for i, stock in enumerate(top_stocks, 1):
+                if detailed and i <= DETAILED_STOCK_LIMIT:
+                    blocks.append(_STOCK_DETAIL_TMPL(
+                        i=i,
+                        symbol=stock.get('symbol', 'N/A'),
+                        open_price=stock.get('open_price', 0),
+                        ltp=stock.get('ltp', 0),
+                        prev_close=stock.get('prev_close', 0),
+                        prev_day_high=stock.get('prev_day_high', 0),
+                        percentage_change=stock.get('percentage_change', 0),
+                        volume=self._format_volume(stock.get('volume', 0)),
+                        source=stock.get('source', 'Unknown')
+                    ))
+                else:
+                    blocks.append(_STOCK_ROW_TMPL(
+                        i=i,
+                        symbol=stock.get('symbol', 'N/A'),
+                        open_price=stock.get('open_price', 0),
+                        ltp=stock.get('ltp', 0),
+                        percentage_change=stock.get('percentage_change', 0)
+                    ))
             
-            # Add footer if more than 10 stocks
-            if len(filtered_stocks) > 10:
-                summary += f"... and {len(filtered_stocks) - 10} more stocks\n\n"
+            # Footer: overflow count if more than 10 stocks, then criteria info
+            footer = []
+            if len(filtered_stocks) > SUMMARY_STOCK_LIMIT:
+                footer.append(_MORE_STOCKS_TMPL(count=len(filtered_stocks) - SUMMARY_STOCK_LIMIT))
+            footer.append(_CRITERIA_TMPL(min_pct=settings.MIN_PERCENTAGE_INCREASE))
+            blocks.append("".join(footer))
             
-            # Add criteria info
-            summary += f"📋 <b>Criteria:</b>\n"
-            summary += f"• Open > Previous Day High\n"
-            summary += f"• Change ≥ {settings.MIN_PERCENTAGE_INCREASE}%\n"
+            return blocks
             
-            return summary
+        except Exception as e:
+            logger.error("Error formatting summary alert: %s", e)
+            return [f"🔍 STOCK SCAN COMPLETE\n❌ Error formatting summary\n⏰ {datetime.now().strftime('%H:%M:%S')}"]
+    
+    def format_summary_alert(self, filtered_stocks: List[Dict[str, Any]], detailed: bool = False,
+                             ts: Optional[str] = None) -> str:
+        """Format a summary alert with all filtered stocks"""
+        return "".join(self._build_summary_blocks(filtered_stocks, detailed, ts))
+    
+    def _split_summary(self, blocks: List[str]) -> List[str]:
+        """Join summary blocks into as few messages as fit Telegram's limit, splitting at stock boundaries"""
+        messages = []
+        current = ""
+        for block in blocks:
+            if current and len(current) + len(block) > TELEGRAM_MAX_MESSAGE_LENGTH:
+                messages.append(current)
+                current = ""
+            # A single block over the limit can only be cut mid-text
+            while len(block) > TELEGRAM_MAX_MESSAGE_LENGTH:
+                messages.append(block[:TELEGRAM_MAX_MESSAGE_LENGTH])
+                block = block[TELEGRAM_MAX_MESSAGE_LENGTH:]
+            current += block
+        if current or not messages:
+            messages.append(current)
+        return messages
+    
+    async def _send_telegram_message_async(self, session: aiohttp.ClientSession,
+                                           limiter: _AsyncRateLimiter, message: str) -> bool:
+        """Send a message to Telegram from the event loop"""
+        try:
+            payload = {**self._base_payload, 'text': message}
             
+            await limiter.wait()
+            async with session.post(self._send_url, data=_dumps(payload), headers=_JSON_HEADERS) as response:
+                if response.status == 200:
+                    result = await response.json(content_type=None)
+                    if result.get('ok'):
+                        logger.info("Telegram message sent successfully")
+                        return True
+                    logger.error("Telegram API error: %s", result.get('description', 'Unknown error'))
+                    return False
+                logger.error("Telegram HTTP error %d: %s", response.status, await response.text())
+                return False
+                
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error("Error sending Telegram message: %s", e)
+            return False
         except Exception as e:
-            logger.error(f"Error formatting summary alert: {e}")
-            return f"🔍 STOCK SCAN COMPLETE\n❌ Error formatting summary\n⏰ {datetime.now().strftime('%H:%M:%S')}"
+            logger.error("Unexpected error sending Telegram message: %s", e)
+            return False
     
-    def send_alerts(self, filtered_stocks: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Send alerts for filtered stocks"""
+    async def send_alerts_async(self, filtered_stocks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Send alerts for filtered stocks from the event loop"""
         try:
             if not self.bot_token or not self.chat_id:
                 logger.error("Cannot send alerts - Telegram not configured")
@@ -152,32 +305,23 @@ class AlertAgent:
                     'alerts_sent': 0
                 }
             
-            alerts_sent = 0
+            # One timestamp for the whole batch, since every message belongs to the same scan
+            ts = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
-            # Send summary alert
-            summary_message = self.format_summary_alert(filtered_stocks)
-            if self.send_telegram_message(summary_message):
-                alerts_sent += 1
-                logger.info("Summary alert sent successfully")
+            # One summary carrying full details for the top performers; split only if over Telegram's limit
+            messages = self._split_summary(self._build_summary_blocks(filtered_stocks, detailed=True, ts=ts))
             
-            # Send individual alerts for top performers (limit to 5 to avoid spam)
-            if filtered_stocks:
-                top_stocks = sorted(
-                    filtered_stocks, 
-                    key=lambda x: x.get('percentage_change', 0), 
-                    reverse=True
-                )[:5]
-                
-                for stock in top_stocks:
-                    individual_alert = self.format_stock_alert(stock)
-                    if self.send_telegram_message(individual_alert):
-                        alerts_sent += 1
-                        logger.info(f"Individual alert sent for {stock.get('symbol', 'Unknown')}")
-                    
-                    # Small delay between messages
-                    import time
-                    time.sleep(1)
+            limiter = _AsyncRateLimiter(TELEGRAM_CHAT_INTERVAL)
+            connector = aiohttp.TCPConnector(limit=4, keepalive_timeout=60)
+            timeout = aiohttp.ClientTimeout(total=10)
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                # One after another so the parts arrive in order
+                results = [await self._send_telegram_message_async(session, limiter, message) for message in messages]
             
+            if all(results):
+                logger.info("Summary alert sent successfully")
+            
+            alerts_sent = sum(results)
             return {
                 'success': True,
                 'message': f'Successfully sent {alerts_sent} alerts',
@@ -186,7 +330,19 @@ class AlertAgent:
             }
             
         except Exception as e:
-            logger.error(f"Error sending alerts: {e}")
+            logger.error("Error sending alerts: %s", e)
+            return {
+                'success': False,
+                'message': f'Error sending alerts: {str(e)}',
+                'alerts_sent': 0
+            }
+    
+    def send_alerts(self, filtered_stocks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Send alerts for filtered stocks (blocking wrapper around send_alerts_async)"""
+        try:
+            return asyncio.run(self.send_alerts_async(filtered_stocks))
+        except Exception as e:
+            logger.error("Error sending alerts: %s", e)
             return {
                 'success': False,
                 'message': f'Error sending alerts: {str(e)}',
@@ -215,7 +371,7 @@ class AlertAgent:
             return self.send_telegram_message(formatted_message)
             
         except Exception as e:
-            logger.error(f"Error sending system alert: {e}")
+            logger.error("Error sending system alert: %s", e)
             return False
     
     def test_telegram_connection(self) -> bool:
@@ -231,5 +387,5 @@ class AlertAgent:
             return self.send_telegram_message(test_message)
             
         except Exception as e:
-            logger.error(f"Error testing Telegram connection: {e}")
+            logger.error("Error testing Telegram connection: %s", e)
             return False
\ No newline at end of file
@@ -1,51 +1,53 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 import logging
+import time
 from data_sources.nse_client import NSEClient
 
 logger = logging.getLogger(__name__)
 
+__all__ = ['DataAgent']
+
 class DataAgent:
     """Agent responsible for fetching REAL stock data from NSE and Yahoo Finance (fallback)"""
     
     def __init__(self):
         self.nse_client = NSEClient()
-        self.fo_stocks = []
+        self.fo_stocks: Tuple[str, ...] = ()
         self.stock_data = []
         logger.info("✅ DataAgent initialized - using NSE and Yahoo Finance only")
     
-    def fetch_fo_stocks_from_all_sources(self) -> List[str]:
+    def fetch_fo_stocks_from_all_sources(self) -> Tuple[str, ...]:
         """Fetch F&O stocks from NSE (robust)"""
         try:
             logger.info("📊 Fetching F&O stocks from NSE...")
             nse_stocks = self.nse_client.get_fo_stocks()
             if nse_stocks:
-                self.fo_stocks = nse_stocks
-                logger.info(f"✅ NSE: {len(nse_stocks)} stocks")
+                self.fo_stocks = tuple(nse_stocks)
+                logger.info("✅ NSE: %d stocks", len(nse_stocks))
             else:
                 logger.warning("⚠️ NSE: No stocks returned")
             return self.fo_stocks
         except Exception as e:
-            logger.error(f"❌ Error fetching F&O stocks: {e}")
-            return []
+            logger.error("❌ Error fetching F&O stocks: %s", e)
+            return ()
     
     def fetch_stock_data_real_only(self, symbols: List[str]) -> List[Dict[str, Any]]:
         """Fetch REAL stock data using NSE and Yahoo Finance (fallback)"""
         try:
-            logger.info(f"🎯 Fetching REAL data for {len(symbols)} symbols...")
+            logger.info("🎯 Fetching REAL data for %d symbols...", len(symbols))
             all_stock_data = self.nse_client.get_stock_data(symbols)
             if all_stock_data:
                 self.stock_data = all_stock_data
-                logger.info(f"✅ Data collection complete: {len(all_stock_data)} stocks")
+                logger.info("✅ Data collection complete: %d stocks", len(all_stock_data))
             else:
                 logger.error("❌ No real stock data available - check data sources!")
             return self.stock_data
         except Exception as e:
-            logger.error(f"❌ Error fetching stock data: {e}")
+            logger.error("❌ Error fetching stock data: %s", e)
             return []
     
     def get_all_data(self) -> Dict[str, Any]:
         """Get all F&O stocks and their REAL data"""
-        import time  # Fix: Ensure time is imported
         try:
             start_time = time.time()
             
@@ -73,10 +75,15 @@ class DataAgent:
             }
             
             if stock_data:
-                # Calculate data quality metrics
-                real_data_count = len([s for s in stock_data if 'real' in s.get('source', '').lower()])
-                oi_data_count = len([s for s in stock_data if s.get('total_oi', 0) > 0])
-                prev_day_count = len([s for s in stock_data if s.get('prev_day_high', 0) > 0])
+                # Calculate data quality metrics in a single pass
+                real_data_count = oi_data_count = prev_day_count = 0
+                for s in stock_data:
+                    if 'real' in s.get('source', '').lower():
+                        real_data_count += 1
+                    if s.get('total_oi', 0) > 0:
+                        oi_data_count += 1
+                    if s.get('prev_day_high', 0) > 0:
+                        prev_day_count += 1
                 
                 result.update({
                     "real_data_percentage": round((real_data_count / len(stock_data)) * 100, 1),
@@ -85,12 +92,12 @@ class DataAgent:
                     "data_quality": "HIGH" if real_data_count > len(stock_data) * 0.8 else "MEDIUM"
                 })
                 
-                logger.info(f"✅ Data collection successful:")
-                logger.info(f"   📊 F&O Stocks: {len(fo_stocks)}")
-                logger.info(f"   📈 Real Data: {len(stock_data)} stocks ({result['real_data_percentage']}% real)")
-                logger.info(f"   📋 OI Data: {oi_data_count} stocks")
-                logger.info(f"   📅 Prev Day Data: {prev_day_count} stocks")
-                logger.info(f"   ⏱️ Duration: {duration:.2f}s")
+                logger.info("✅ Data collection successful:")
+                logger.info("   📊 F&O Stocks: %d", len(fo_stocks))
+                logger.info("   📈 Real Data: %d stocks (%s%% real)", len(stock_data), result['real_data_percentage'])
+                logger.info("   📋 OI Data: %d stocks", oi_data_count)
+                logger.info("   📅 Prev Day Data: %d stocks", prev_day_count)
+                logger.info("   ⏱️ Duration: %.2fs", duration)
             else:
                 logger.error("❌ No real stock data collected!")
                 result["error"] = "No real stock data available"
@@ -98,7 +105,7 @@ class DataAgent:
             return result
             
         except Exception as e:
-            logger.error(f"❌ Error in get_all_data: {e}")
+            logger.error("❌ Error in get_all_data: %s", e)
             return {
                 "fo_stocks": [], 
                 "stock_data": [], 
@@ -110,7 +117,7 @@ class DataAgent:
         """Return the collected REAL stock data"""
         return self.stock_data
     
-    def get_fo_stocks(self) -> List[str]:
+    def get_fo_stocks(self) -> Tuple[str, ...]:
         """Return the F&O stock symbols"""
         return self.fo_stocks
     
@@ -121,27 +128,29 @@ class DataAgent:
         
         total_stocks = len(self.stock_data)
         
-        # Count different data types
-        real_sources = len([s for s in self.stock_data if 'real' in s.get('source', '').lower()])
-        nse_sources = len([s for s in self.stock_data if 'nse' in s.get('source', '').lower()])
-        yfinance_sources = len([s for s in self.stock_data if 'yfinance' in s.get('source', '').lower()])
-        
-        # Count data completeness
-        complete_ohlc = len([s for s in self.stock_data if all([
-            s.get('open_price', 0) > 0,
-            s.get('high_price', 0) > 0,
-            s.get('low_price', 0) > 0,
-            s.get('ltp', 0) > 0
-        ])])
+        # Count data sources and completeness in a single pass
+        real_sources = nse_sources = yfinance_sources = 0
+        complete_ohlc = prev_day_complete = oi_available = volume_available = 0
         
-        prev_day_complete = len([s for s in self.stock_data if all([
-            s.get('prev_day_high', 0) > 0,
-            s.get('prev_day_open', 0) > 0,
-            s.get('prev_day_low', 0) > 0
-        ])])
-        
-        oi_available = len([s for s in self.stock_data if s.get('total_oi', 0) > 0])
-        volume_available = len([s for s in self.stock_data if s.get('volume', 0) > 0])
+        for s in self.stock_data:
+            src_lc = s.get('source', '').lower()
+            if 'real' in src_lc:
+                real_sources += 1
+            if 'nse' in src_lc:
+                nse_sources += 1
+            if 'yfinance' in src_lc:
+                yfinance_sources += 1
+            
+            if (s.get('open_price', 0) > 0 and s.get('high_price', 0) > 0 and
+                    s.get('low_price', 0) > 0 and s.get('ltp', 0) > 0):
+                complete_ohlc += 1
+            pd_h = s.get('prev_day_high', 0)
+            if pd_h > 0 and s.get('prev_day_open', 0) > 0 and s.get('prev_day_low', 0) > 0:
+                prev_day_complete += 1
+            if s.get('total_oi', 0) > 0:
+                oi_available += 1
+            if s.get('volume', 0) > 0:
+                volume_available += 1
         
         return {
             "total_stocks": total_stocks,
@@ -1,15 +1,129 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Callable, Iterator
+import bisect
+import heapq
 import logging
+import math
+import re
+import time
+from operator import itemgetter
+from datetime import datetime
+from functools import lru_cache
+import numpy as np
 from config.settings import settings
+from agents._filter_kernels import evaluate
+
+try:
+    from agents import _filter_ext
+except ImportError:  # compiled extension is optional
+    _filter_ext = None
 
 logger = logging.getLogger(__name__)
 
+# Numeric columns pulled out of the stock dicts for the vectorized filter
+_SOA_FIELDS = ('open_price', 'ltp', 'prev_close', 'prev_day_high', 'volume', 'total_oi')
+
+# Fields checked by the inline REAL data validation in filter_stocks
+_VALIDATION_FIELDS = ('symbol', 'open_price', 'ltp', 'prev_close')
+_get_validation_fields = itemgetter(*_VALIDATION_FIELDS)
+
+# Columns used by the BUY/SELL signal filter
+_SIGNAL_FIELDS = ('open', 'prev_high', 'prev_low')
+
+# Data quality labels by score band (>= 4 FAIR, >= 6 GOOD, >= 8 EXCELLENT)
+_QUALITY_THRESHOLDS = (4, 6, 8)
+_QUALITY_LABELS = ("POOR", "FAIR", "GOOD", "EXCELLENT")
+_QUALITY_RANK = {label: rank for rank, label in enumerate(_QUALITY_LABELS)}
+
+# Source quality points for the first of these substrings found in the lowercased source, else 1
+_SOURCE_SCORES = {'nse': 3, 'yfinance': 2}
+_REAL_SOURCE_TAG = 'real'
+
+# Export formatters, bound once at import
+_fmt_money = '₹{:.2f}'.format
+_fmt_pct = '{:.2f}%'.format
+_fmt_count = '{:,}'.format
+_fmt_score = '{:.2f}'.format
+
+# Sources that indicate non-real data
+_BAD_SOURCE_RE = re.compile(r'synthetic|fake|generated', re.IGNORECASE)
+
+def _safe_float(value: Any) -> float:
+    """float(value), or NaN when it is None or cannot be converted"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _float_or_zero(value: Any) -> float:
+    """float(value), or 0.0 when it cannot be converted (the BUY/SELL filter treats blanks as 0)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _parse_pct(value: Any) -> float:
+    """Parse a percentage given as a number or a string like '7.3%', or 0.0 when invalid"""
+    if type(value) is float or type(value) is int:
+        return float(value)
+    try:
+        text = str(value)
+        # Usual '7.3%' form: slice off the suffix instead of scanning the string with replace()
+        return float(text[:-1] if text.endswith('%') else text)
+    except ValueError:
+        pass
+    except Exception:
+        return 0.0
+    try:
+        return float(text.replace('%', ''))
+    except Exception:
+        return 0.0
+
+
+@lru_cache(maxsize=4096)
+def _data_quality(source: str, prev_day_high: float, volume: float, total_oi: float) -> str:
+    """Data quality label from the fields it depends on; memoized so reruns on the same rows are lookups"""
+    quality_score = 0
+    
+    # Source quality
+    source = source.lower()
+    quality_score += next((points for tag, points in _SOURCE_SCORES.items() if tag in source), 1)
+    
+    # Data completeness
+    if prev_day_high > 0:
+        quality_score += 2
+    if volume > 1000:
+        quality_score += 1
+    if total_oi > 0:
+        quality_score += 2
+    
+    # Real data indicators
+    if _REAL_SOURCE_TAG in source:
+        quality_score += 2
+    
+    return _QUALITY_LABELS[bisect.bisect_right(_QUALITY_THRESHOLDS, quality_score)]
+
+
 class FilterAgent:
     """Agent responsible for filtering stocks based on REAL data strategy criteria"""
     
     def __init__(self):
         self.min_percentage_increase = settings.MIN_PERCENTAGE_INCREASE
         self.filtered_stocks = []
+        
+        # Positions in filtered_stocks grouped by data quality label and by lowercased source
+        self._by_quality: Dict[str, List[int]] = {}
+        self._by_source: Dict[str, List[int]] = {}
+        self._with_oi: List[int] = []
+        
+        # Formatted timestamp reused for every call within the same wall-clock second
+        self._timestamp_second = -1
+        self._timestamp = ''
+        
+        # Summary of the current filtered_stocks, tagged with the version it was built for
+        self._summary_version = 0
+        self._summary_cache = None
         logger.info("✅ FilterAgent initialized - focusing on REAL data filtering")
     
     def filter_stocks(self, stock_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -20,262 +134,233 @@ class FilterAgent:
         3. Only REAL data - no synthetic calculations
         """
         filtered_stocks = []
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         
-        logger.info(f"🎯 Starting REAL data filtering for {len(stock_data)} stocks...")
+        # Local bindings for names used inside the per-row loops
+        min_pct = self.min_percentage_increase
+        bad_source = _BAD_SOURCE_RE.search
+        _number = (int, float)
+        assess_quality = self._assess_data_quality
+        _debug = logger.debug
+        _info = logger.info
+        _round = round
+        _float = float
+        _int = int
+        get_fields = _get_validation_fields
+        
+        logger.info("🎯 Starting REAL data filtering for %d stocks...", len(stock_data))
         
         if not stock_data:
             logger.warning("❌ No stock data provided for filtering!")
             return []
         
-        # First, validate all stocks have real data
+        # First, validate all stocks have real data: positive numeric symbol and prices, a real source,
+        # prices within ₹5-₹1,00,000 and at most a 3x move either way from the previous close
         valid_stocks = []
         for stock in stock_data:
-            if self._validate_real_stock_data(stock):
+            try:
+                try:
+                    symbol, open_price, ltp, prev_close = get_fields(stock)
+                except KeyError:
+                    symbol, open_price, ltp, prev_close = (stock.get(field, 0) for field in _VALIDATION_FIELDS)
+                valid = (isinstance(symbol, _number) and symbol > 0 and
+                         isinstance(open_price, _number) and open_price > 0 and
+                         isinstance(ltp, _number) and ltp > 0 and
+                         isinstance(prev_close, _number) and prev_close > 0 and
+                         not bad_source(stock.get('source', '')) and
+                         5 <= ltp <= 100000 and 5 <= prev_close <= 100000 and
+                         0.3 <= ltp / prev_close <= 3.0)
+            except Exception:
+                valid = False
+            
+            if valid:
                 valid_stocks.append(stock)
-            else:
-                logger.debug(f"❌ Skipping {stock.get('symbol', 'Unknown')} - invalid real data")
+            elif debug_enabled:
+                _debug("❌ Skipping %s - invalid real data", stock.get('symbol', 'Unknown'))
         
-        logger.info(f"📊 {len(valid_stocks)} stocks have valid REAL data")
+        logger.info("📊 %d stocks have valid REAL data", len(valid_stocks))
         
-        for stock in valid_stocks:
-            try:
+        # Struct-of-arrays view of the valid stocks; the kernel evaluates every predicate and score in one pass.
+        # CRITICAL: prev_day_high falls back to prev_close when the REAL previous day high is missing
+        if _filter_ext is not None:
+            cols, results = _filter_ext.filter_batch(valid_stocks, _float(min_pct))
+        else:
+            cols = self._to_soa(valid_stocks)
+            results = evaluate(
+                cols['open_price'], cols['ltp'], cols['prev_close'], cols['prev_day_high'],
+                cols['volume'], cols['total_oi'], _float(min_pct)
+            )
+        mask, prev_day_high, percentage_change, gap_up_percentage, filter_score = results
+        open_price = cols['open_price']
+        ltp = cols['ltp']
+        prev_close = cols['prev_close']
+        volume = cols['volume']
+        total_oi = cols['total_oi']
+        
+        # Log detailed REAL data analysis and failure reasons
+        if debug_enabled:
+            for i, stock in enumerate(valid_stocks):
                 symbol = stock.get('symbol', '')
-                open_price = float(stock.get('open_price', 0))
-                ltp = float(stock.get('ltp', 0))
-                prev_close = float(stock.get('prev_close', 0))
-                prev_day_high = float(stock.get('prev_day_high', 0))
-                volume = int(stock.get('volume', 0))
-                
-                # CRITICAL: Only proceed if we have REAL previous day high
-                if prev_day_high <= 0:
-                    # Try to use prev_close as fallback only if it's reasonable
-                    if prev_close > 0:
-                        prev_day_high = prev_close
-                        logger.debug(f"⚠️ {symbol}: Using prev_close as prev_day_high fallback")
-                    else:
-                        logger.debug(f"❌ {symbol}: No valid previous day high data")
-                        continue
-                
-                # FILTER CONDITION 1: Gap Up - Open > Previous Day High
-                gap_up_condition = open_price > prev_day_high
-                gap_up_percentage = ((open_price - prev_day_high) / prev_day_high) * 100 if prev_day_high > 0 else 0
-                
-                # FILTER CONDITION 2: Momentum - LTP >= minimum percentage increase
-                if prev_close > 0:
-                    percentage_change = ((ltp - prev_close) / prev_close) * 100
-                else:
-                    logger.debug(f"❌ {symbol}: Invalid prev_close = {prev_close}")
+                if np.isnan(prev_day_high[i]) or np.isnan(volume[i]):
+                    _debug(f"❌ {symbol}: Unparseable previous day high or volume")
+                    continue
+                if prev_day_high[i] <= 0 or prev_close[i] <= 0:
+                    _debug(f"❌ {symbol}: No valid previous day high data")
                     continue
                 
-                momentum_condition = percentage_change >= self.min_percentage_increase
-                
-                # ADDITIONAL REAL DATA FILTERS
-                # Filter 3: Volume validation (ensure real trading activity)
-                volume_condition = volume > 1000
-                
-                # Filter 4: Price sanity (real stock price range)
-                price_sanity = 10 <= ltp <= 50000
-                
-                # Filter 5: Gap should be reasonable (not data error)
-                reasonable_gap = 0.1 <= gap_up_percentage <= 25  # Between 0.1% and 25%
-                
-                # Filter 6: Change should be reasonable
-                reasonable_change = -50 <= percentage_change <= 100  # Between -50% and +100%
+                gap_up_condition = open_price[i] > prev_day_high[i]
+                momentum_condition = percentage_change[i] >= min_pct
+                volume_condition = volume[i] > 1000
+                price_sanity = 10 <= ltp[i] <= 50000
                 
-                # Log detailed REAL data analysis
-                logger.debug(f"""
-                REAL DATA Analysis for {symbol}:
-                - LTP: ₹{ltp:.2f} | Open: ₹{open_price:.2f} | Prev Close: ₹{prev_close:.2f}
-                - Prev Day High: ₹{prev_day_high:.2f} | Volume: {volume:,}
-                - Gap Up %: {gap_up_percentage:.2f}% | Change %: {percentage_change:.2f}%
-                - Source: {stock.get('source', 'unknown')}
-                - Filters: Gap={gap_up_condition} | Momentum={momentum_condition} | Vol={volume_condition} | Price={price_sanity}
-                """)
+                _debug(f"""
+                    REAL DATA Analysis for {symbol}:
+                    - LTP: ₹{ltp[i]:.2f} | Open: ₹{open_price[i]:.2f} | Prev Close: ₹{prev_close[i]:.2f}
+                    - Prev Day High: ₹{prev_day_high[i]:.2f} | Volume: {_int(volume[i]):,}
+                    - Gap Up %: {gap_up_percentage[i]:.2f}% | Change %: {percentage_change[i]:.2f}%
+                    - Source: {stock.get('source', 'unknown')}
+                    - Filters: Gap={gap_up_condition} | Momentum={momentum_condition} | Vol={volume_condition} | Price={price_sanity}
+                    """)
                 
-                # Apply all REAL data filters
-                if (gap_up_condition and momentum_condition and 
-                    volume_condition and price_sanity and reasonable_gap and reasonable_change):
-                    
-                    # Calculate additional real metrics
-                    day_change = ltp - open_price
-                    day_change_pct = ((ltp - open_price) / open_price) * 100 if open_price > 0 else 0
-                    
-                    # Add comprehensive data to filtered stock
-                    filtered_stock = stock.copy()
-                    filtered_stock.update({
-                        'percentage_change': round(percentage_change, 2),
-                        'gap_up_percentage': round(gap_up_percentage, 2),
-                        'day_change': round(day_change, 2),
-                        'day_change_percentage': round(day_change_pct, 2),
-                        'gap_up_condition': gap_up_condition,
-                        'momentum_condition': momentum_condition,
-                        'filter_timestamp': self._get_current_timestamp(),
-                        'data_quality': self._assess_data_quality(stock),
-                        'filter_score': self._calculate_filter_score(stock, gap_up_percentage, percentage_change)
-                    })
-                    
-                    filtered_stocks.append(filtered_stock)
-                    
-                    logger.info(f"✅ {symbol} PASSED all REAL data filters:")
-                    logger.info(f"   📈 Gap Up: ₹{open_price:.2f} > ₹{prev_day_high:.2f} (+{gap_up_percentage:.2f}%)")
-                    logger.info(f"   🚀 Momentum: {percentage_change:.2f}% (≥{self.min_percentage_increase}%)")
-                    logger.info(f"   📊 Volume: {volume:,} | Quality: {filtered_stock['data_quality']}")
-                    
-                else:
-                    # Log specific failure reasons for debugging
+                if not mask[i]:
                     reasons = []
                     if not gap_up_condition:
-                        reasons.append(f"No gap up: ₹{open_price:.2f} <= ₹{prev_day_high:.2f}")
+                        reasons.append(f"No gap up: ₹{open_price[i]:.2f} <= ₹{prev_day_high[i]:.2f}")
                     if not momentum_condition:
-                        reasons.append(f"Low momentum: {percentage_change:.2f}% < {self.min_percentage_increase}%")
+                        reasons.append(f"Low momentum: {percentage_change[i]:.2f}% < {min_pct}%")
                     if not volume_condition:
-                        reasons.append(f"Low volume: {volume:,}")
+                        reasons.append(f"Low volume: {_int(volume[i]):,}")
                     if not price_sanity:
-                        reasons.append(f"Price out of range: ₹{ltp:.2f}")
-                    if not reasonable_gap:
-                        reasons.append(f"Unreasonable gap: {gap_up_percentage:.2f}%")
-                    if not reasonable_change:
-                        reasons.append(f"Unreasonable change: {percentage_change:.2f}%")
+                        reasons.append(f"Price out of range: ₹{ltp[i]:.2f}")
+                    if not 0.1 <= gap_up_percentage[i] <= 25:
+                        reasons.append(f"Unreasonable gap: {gap_up_percentage[i]:.2f}%")
+                    if not -50 <= percentage_change[i] <= 100:
+                        reasons.append(f"Unreasonable change: {percentage_change[i]:.2f}%")
                     
-                    logger.debug(f"❌ {symbol} FAILED: {'; '.join(reasons)}")
+                    _debug(f"❌ {symbol} FAILED: {'; '.join(reasons)}")
+            
+        # Only the passing rows walk the Python path to build enriched dicts
+        filter_timestamp = self._get_current_timestamp()  # same second for the whole batch
+        by_quality = {}
+        by_source = {}
+        with_oi = []
+        for i in np.flatnonzero(mask).tolist():
+            stock = valid_stocks[i]
+            try:
+                symbol = stock.get('symbol', '')
+                pct = _float(percentage_change[i])
+                gap_up = _float(gap_up_percentage[i])
+                
+                # Calculate additional real metrics
+                day_change = _float(ltp[i] - open_price[i])
+                day_change_pct = day_change / _float(open_price[i]) * 100 if open_price[i] > 0 else 0
+                
+                # Add comprehensive data to filtered stock
+                filtered_stock = {
+                    **stock,
+                    'percentage_change': _round(pct, 2),
+                    'gap_up_percentage': _round(gap_up, 2),
+                    'day_change': _round(day_change, 2),
+                    'day_change_percentage': _round(day_change_pct, 2),
+                    'gap_up_condition': True,
+                    'momentum_condition': True,
+                    'filter_timestamp': filter_timestamp,
+                    'data_quality': assess_quality(stock),
+                    'filter_score': _float(filter_score[i])
+                }
+                
+                idx = len(filtered_stocks)
+                filtered_stocks.append(filtered_stock)
+                by_quality.setdefault(filtered_stock['data_quality'], []).append(idx)
+                by_source.setdefault(stock.get('source', '').lower(), []).append(idx)
+                if total_oi[i] > 0:
+                    with_oi.append(idx)
+                
+                _info("✅ %s PASSED all REAL data filters:", symbol)
+                _info("   📈 Gap Up: ₹%.2f > ₹%.2f (+%.2f%%)", open_price[i], prev_day_high[i], gap_up)
+                _info("   🚀 Momentum: %.2f%% (≥%s%%)", pct, min_pct)
+                _info("   📊 Volume: %d | Quality: %s", volume[i], filtered_stock['data_quality'])
                 
             except Exception as e:
-                logger.error(f"❌ Error filtering {stock.get('symbol', 'Unknown')}: {e}")
+                logger.error("❌ Error filtering %s: %s", stock.get('symbol', 'Unknown'), e)
                 continue
         
         self.filtered_stocks = filtered_stocks
+        self._by_quality = by_quality
+        self._by_source = by_source
+        self._with_oi = with_oi
+        self._summary_version += 1
         
         # Enhanced logging with real data insights
         total_scanned = len(valid_stocks)
         total_passed = len(filtered_stocks)
         success_rate = (total_passed / total_scanned * 100) if total_scanned > 0 else 0
         
-        logger.info(f"🎯 REAL DATA Filter Results:")
-        logger.info(f"   📊 Valid Real Data: {total_scanned} stocks")
-        logger.info(f"   ✅ Passed Filters: {total_passed} stocks ({success_rate:.1f}%)")
-        logger.info(f"   📈 Min Gap Up Required: > Previous Day High")
-        logger.info(f"   🚀 Min % Change Required: {self.min_percentage_increase}%")
+        _info("🎯 REAL DATA Filter Results:")
+        _info("   📊 Valid Real Data: %d stocks", total_scanned)
+        _info("   ✅ Passed Filters: %d stocks (%.1f%%)", total_passed, success_rate)
+        _info("   📈 Min Gap Up Required: > Previous Day High")
+        _info("   🚀 Min %% Change Required: %s%%", min_pct)
         
         if filtered_stocks:
             # Show top performers with real data
-            top_performers = sorted(filtered_stocks, key=lambda x: x['percentage_change'], reverse=True)[:3]
-            logger.info(f"   🏆 Top REAL Data Performers:")
+            top_performers = heapq.nlargest(3, filtered_stocks, key=itemgetter('percentage_change'))
+            _info("   🏆 Top REAL Data Performers:")
             for i, stock in enumerate(top_performers, 1):
-                quality = stock.get('data_quality', 'Unknown')
-                source = stock.get('source', 'unknown')
-                logger.info(f"      {i}. {stock['symbol']}: +{stock['percentage_change']:.2f}% | Gap: +{stock['gap_up_percentage']:.2f}% | Quality: {quality} | Source: {source}")
+                _info("      %d. %s: +%.2f%% | Gap: +%.2f%% | Quality: %s | Source: %s",
+                      i, stock['symbol'], stock['percentage_change'], stock['gap_up_percentage'],
+                      stock.get('data_quality', 'Unknown'), stock.get('source', 'unknown'))
         
         return filtered_stocks
     
-    def _validate_real_stock_data(self, stock: Dict[str, Any]) -> bool:
-        """Validate that stock has real, usable data for filtering"""
-        try:
-            required_fields = ['symbol', 'open_price', 'ltp', 'prev_close']
-            
-            for field in required_fields:
-                value = stock.get(field, 0)
-                if not isinstance(value, (int, float)) or value <= 0:
-                    return False
-            
-            # Check that source indicates real data
-            source = stock.get('source', '').lower()
-            if 'synthetic' in source or 'fake' in source or 'generated' in source:
-                return False
-            
-            # Additional sanity checks
-            ltp = stock['ltp']
-            prev_close = stock['prev_close']
-            
-            # Prices should be in reasonable range
-            if not (5 <= ltp <= 100000) or not (5 <= prev_close <= 100000):
-                return False
-            
-            # Change should not be completely unrealistic
-            if prev_close > 0:
-                change_ratio = ltp / prev_close
-                if not (0.3 <= change_ratio <= 3.0):  # Max 300% change either way
-                    return False
-            
-            return True
-            
-        except Exception:
-            return False
+    def _to_soa(self, stock_data: List[Dict[str, Any]], fields: Tuple[str, ...] = _SOA_FIELDS,
+                parse: Callable[[Any], float] = _safe_float) -> Dict[str, np.ndarray]:
+        """Extract numeric columns from stock dicts as float64 arrays"""
+        n = len(stock_data)
+        
+        # Fast path: fetch every field of a row in one C-level itemgetter call into a structured array.
+        # It converts like _safe_float (None -> NaN); missing keys or unparseable values fall back to per-field parsing.
+        if parse is _safe_float and n:
+            try:
+                rows = np.fromiter(
+                    map(itemgetter(*fields), stock_data) if len(fields) > 1 else ((s[fields[0]],) for s in stock_data),
+                    dtype=np.dtype([(field, np.float64) for field in fields]),
+                    count=n
+                )
+                return {field: np.ascontiguousarray(rows[field]) for field in fields}
+            except (TypeError, ValueError, KeyError):
+                pass
+        
+        return {
+            field: np.fromiter((parse(s.get(field, 0)) for s in stock_data), dtype=np.float64, count=n)
+            for field in fields
+        }
     
     def _assess_data_quality(self, stock: Dict[str, Any]) -> str:
         """Assess the quality of real data for this stock"""
         try:
-            quality_score = 0
-            
-            # Source quality
-            source = stock.get('source', '').lower()
-            if 'nse' in source:
-                quality_score += 3
-            elif 'yfinance' in source:
-                quality_score += 2
-            else:
-                quality_score += 1
-            
-            # Data completeness
-            if stock.get('prev_day_high', 0) > 0:
-                quality_score += 2
-            if stock.get('volume', 0) > 1000:
-                quality_score += 1
-            if stock.get('total_oi', 0) > 0:
-                quality_score += 2
-            
-            # Real data indicators
-            if 'real' in source:
-                quality_score += 2
-            
-            if quality_score >= 8:
-                return "EXCELLENT"
-            elif quality_score >= 6:
-                return "GOOD"
-            elif quality_score >= 4:
-                return "FAIR"
-            else:
-                return "POOR"
-                
+            return _data_quality(
+                stock.get('source', ''), stock.get('prev_day_high', 0),
+                stock.get('volume', 0), stock.get('total_oi', 0)
+            )
         except Exception:
             return "UNKNOWN"
     
-    def _calculate_filter_score(self, stock: Dict[str, Any], gap_up_pct: float, change_pct: float) -> float:
-        """Calculate a filter score for ranking stocks"""
-        try:
-            score = 0.0
-            
-            # Gap up score (0-40 points)
-            score += min(gap_up_pct * 2, 40)
-            
-            # Momentum score (0-40 points)
-            score += min(change_pct * 2, 40)
-            
-            # Volume score (0-10 points)
-            volume = stock.get('volume', 0)
-            if volume > 100000:
-                score += 10
-            elif volume > 50000:
-                score += 7
-            elif volume > 10000:
-                score += 5
-            elif volume > 1000:
-                score += 2
-            
-            # OI score (0-10 points)
-            if stock.get('total_oi', 0) > 0:
-                score += 10
-            
-            return round(score, 2)
-            
-        except Exception:
-            return 0.0
-    
     def get_filtered_stocks(self) -> List[Dict[str, Any]]:
         """Return the filtered stocks with real data"""
         return self.filtered_stocks
     
     def get_detailed_filter_summary(self) -> Dict[str, Any]:
-        """Get detailed summary of filtering results with real data insights"""
+        """Get detailed summary of filtering results with real data insights.
+        
+        The returned dict is cached until the next filter run and shared between callers: treat it as read-only.
+        """
+        if self._summary_cache is None or self._summary_cache[0] != self._summary_version:
+            self._summary_cache = (self._summary_version, self._build_detailed_filter_summary())
+        return self._summary_cache[1]
+    
+    def _build_detailed_filter_summary(self) -> Dict[str, Any]:
+        """Compute the detailed filter summary for the current filtered stocks"""
         if not self.filtered_stocks:
             return {
                 'total_filtered': 0,
@@ -292,35 +377,38 @@ class FilterAgent:
                 }
             }
         
-        # Calculate comprehensive statistics from real data
-        percentage_changes = [stock['percentage_change'] for stock in self.filtered_stocks]
-        gap_ups = [stock.get('gap_up_percentage', 0) for stock in self.filtered_stocks]
-        volumes = [stock.get('volume', 0) for stock in self.filtered_stocks]
-        filter_scores = [stock.get('filter_score', 0) for stock in self.filtered_stocks]
-        
-        avg_change = sum(percentage_changes) / len(percentage_changes)
-        avg_gap_up = sum(gap_ups) / len(gap_ups) if gap_ups else 0
-        avg_volume = sum(volumes) / len(volumes) if volumes else 0
-        avg_score = sum(filter_scores) / len(filter_scores) if filter_scores else 0
-        
-        # Data quality distribution
+        # Calculate comprehensive statistics and distributions from real data in a single pass
+        total = len(self.filtered_stocks)
+        sum_change = sum_gap_up = sum_volume = sum_score = 0
+        max_change = -math.inf
+        min_change = math.inf
         quality_dist = {}
+        source_dist = {}
+        
         for stock in self.filtered_stocks:
+            change = stock['percentage_change']
+            sum_change += change
+            if change > max_change:
+                max_change = change
+            if change < min_change:
+                min_change = change
+            
+            sum_gap_up += stock.get('gap_up_percentage', 0)
+            sum_volume += stock.get('volume', 0)
+            sum_score += stock.get('filter_score', 0)
+            
             quality = stock.get('data_quality', 'Unknown')
             quality_dist[quality] = quality_dist.get(quality, 0) + 1
-        
-        # Source distribution
-        source_dist = {}
-        for stock in self.filtered_stocks:
             source = stock.get('source', 'unknown')
             source_dist[source] = source_dist.get(source, 0) + 1
         
+        avg_change = sum_change / total
+        avg_gap_up = sum_gap_up / total
+        avg_volume = sum_volume / total
+        avg_score = sum_score / total
+        
         # Get top performers with comprehensive data
-        top_performers = sorted(
-            self.filtered_stocks, 
-            key=lambda x: x.get('filter_score', 0), 
-            reverse=True
-        )[:5]
+        top_performers = heapq.nlargest(5, self.filtered_stocks, key=itemgetter('filter_score'))
         
         return {
             'total_filtered': len(self.filtered_stocks),
@@ -328,8 +416,8 @@ class FilterAgent:
             'avg_gap_up_percentage': round(avg_gap_up, 2),
             'avg_volume': int(avg_volume),
             'avg_filter_score': round(avg_score, 2),
-            'max_percentage_change': max(percentage_changes),
-            'min_percentage_change': min(percentage_changes),
+            'max_percentage_change': max_change,
+            'min_percentage_change': min_change,
             'data_quality_distribution': quality_dist,
             'source_distribution': source_dist,
             'top_performers': [
@@ -364,14 +452,18 @@ class FilterAgent:
         return self.get_detailed_filter_summary()
     
     def _get_current_timestamp(self) -> str:
-        """Get current timestamp"""
-        from datetime import datetime
-        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        """Get current timestamp, formatted at most once per second"""
+        now = int(time.time())
+        if now != self._timestamp_second:
+            self._timestamp_second = now
+            self._timestamp = datetime.fromtimestamp(now).strftime('%Y-%m-%d %H:%M:%S')
+        return self._timestamp
     
     def update_filter_criteria(self, min_percentage: float = 0.0, volume_threshold: int = 0):
         """Update filter criteria"""
         if min_percentage is not None:
             self.min_percentage_increase = min_percentage
+            self._summary_version += 1
             logger.info(f"✅ Updated minimum percentage increase to {min_percentage}%")
         
         if volume_threshold is not None:
@@ -383,59 +475,58 @@ class FilterAgent:
         if not self.filtered_stocks:
             return []
         
-        quality_order = {"POOR": 0, "FAIR": 1, "GOOD": 2, "EXCELLENT": 3}
-        min_quality_score = quality_order.get(min_quality, 1)
+        min_quality_score = _QUALITY_RANK.get(min_quality, 1)
         
-        return [
-            stock for stock in self.filtered_stocks 
-            if quality_order.get(stock.get('data_quality', 'POOR'), 0) >= min_quality_score
-        ]
+        indices = sorted(
+            i for quality, positions in self._by_quality.items()
+            if _QUALITY_RANK.get(quality, 0) >= min_quality_score
+            for i in positions
+        )
+        return [self.filtered_stocks[i] for i in indices]
     
     def get_stocks_by_source(self, preferred_source: str = "nse") -> List[Dict[str, Any]]:
         """Get filtered stocks by preferred data source"""
         if not self.filtered_stocks:
             return []
         
-        return [
-            stock for stock in self.filtered_stocks 
-            if preferred_source.lower() in stock.get('source', '').lower()
-        ]
+        preferred = preferred_source.lower()
+        indices = sorted(
+            i for source, positions in self._by_source.items()
+            if preferred in source
+            for i in positions
+        )
+        return [self.filtered_stocks[i] for i in indices]
     
     def get_stocks_with_oi_data(self) -> List[Dict[str, Any]]:
         """Get filtered stocks that have Open Interest data"""
         if not self.filtered_stocks:
             return []
         
-        return [
-            stock for stock in self.filtered_stocks 
-            if stock.get('total_oi', 0) > 0
-        ]
+        return [self.filtered_stocks[i] for i in self._with_oi]
     
-    def export_filtered_data_enhanced(self) -> List[Dict[str, Any]]:
-        """Export filtered data in enhanced format with all real data"""
-        if not self.filtered_stocks:
-            return []
-        
-        export_data = []
+    def iter_filtered_data_enhanced(self) -> Iterator[Dict[str, Any]]:
+        """Yield filtered data rows in enhanced export format with all real data"""
         for stock in self.filtered_stocks:
-            export_data.append({
+            yield {
                 'Symbol': stock['symbol'],
-                'LTP': f"₹{stock['ltp']:.2f}",
-                'Open': f"₹{stock['open_price']:.2f}",
-                'Prev_Close': f"₹{stock['prev_close']:.2f}",
-                'Prev_Day_High': f"₹{stock.get('prev_day_high', 0):.2f}",
-                'Change_%': f"{stock.get('percentage_change', 0):.2f}%",
-                'Gap_Up_%': f"{stock.get('gap_up_percentage', 0):.2f}%",
-                'Volume': f"{stock.get('volume', 0):,}",
-                'Total_OI': f"{stock.get('total_oi', 0):,}",
-                'Change_in_OI': f"{stock.get('change_in_oi', 0):,}",
+                'LTP': _fmt_money(stock['ltp']),
+                'Open': _fmt_money(stock['open_price']),
+                'Prev_Close': _fmt_money(stock['prev_close']),
+                'Prev_Day_High': _fmt_money(stock.get('prev_day_high', 0)),
+                'Change_%': _fmt_pct(stock.get('percentage_change', 0)),
+                'Gap_Up_%': _fmt_pct(stock.get('gap_up_percentage', 0)),
+                'Volume': _fmt_count(stock.get('volume', 0)),
+                'Total_OI': _fmt_count(stock.get('total_oi', 0)),
+                'Change_in_OI': _fmt_count(stock.get('change_in_oi', 0)),
                 'Data_Quality': stock.get('data_quality', 'Unknown'),
-                'Filter_Score': f"{stock.get('filter_score', 0):.2f}",
+                'Filter_Score': _fmt_score(stock.get('filter_score', 0)),
                 'Source': stock.get('source', 'unknown'),
                 'Timestamp': stock.get('filter_timestamp', 'unknown')
-            })
-        
-        return export_data
+            }
+    
+    def export_filtered_data_enhanced(self) -> List[Dict[str, Any]]:
+        """Export filtered data in enhanced format with all real data"""
+        return list(self.iter_filtered_data_enhanced())
     
     def validate_filter_results(self) -> Dict[str, Any]:
         """Validate that all filtered results contain real data"""
@@ -486,29 +577,25 @@ class FilterAgent:
         BUY: Open > Prev High and OI > 7%
         SELL: Open < Prev Low and OI > 7%
         """
-        filtered = []
-        def safe_float(val):
-            try:
-                return float(val)
-            except Exception:
-                return 0.0
-        for stock in stock_data:
-            try:
-                symbol = stock.get('symbol', '')
-                open_price = safe_float(stock.get('open', 0))
-                prev_high = safe_float(stock.get('prev_high', 0))
-                prev_low = safe_float(stock.get('prev_low', 0))
-                oi_change_pct = stock.get('oi_change_pct', 'N/A')
-                try:
-                    oi_change_pct_val = safe_float(str(oi_change_pct).replace('%',''))
-                except Exception:
-                    oi_change_pct_val = 0.0
-                # BUY SIGNAL
-                if open_price > prev_high and oi_change_pct_val > 7:
-                    filtered.append({**stock, 'signal': 'BUY'})
-                # SELL SIGNAL
-                elif open_price < prev_low and oi_change_pct_val > 7:
-                    filtered.append({**stock, 'signal': 'SELL'})
-            except Exception as e:
-                logger.error(f"Error in buy/sell filter for {stock.get('symbol', 'Unknown')}: {e}")
-        return filtered
\ No newline at end of file
+        if not stock_data:
+            return []
+        
+        try:
+            cols = self._to_soa(stock_data, _SIGNAL_FIELDS, _float_or_zero)
+            oi_change_pct = self._to_soa(stock_data, ('oi_change_pct',), _parse_pct)['oi_change_pct']
+        except Exception as e:
+            logger.error(f"Error in buy/sell filter: {e}")
+            return []
+        
+        open_price = cols['open']
+        oi_condition = oi_change_pct > 7
+        # BUY SIGNAL
+        buy_mask = (open_price > cols['prev_high']) & oi_condition
+        # SELL SIGNAL (BUY takes precedence)
+        sell_mask = (open_price < cols['prev_low']) & oi_condition & ~buy_mask
+        
+        signals = np.where(buy_mask, 'BUY', 'SELL')
+        return [
+            {**stock_data[i], 'signal': str(signals[i])}
+            for i in np.flatnonzero(buy_mask | sell_mask).tolist()
+        ]
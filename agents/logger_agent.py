@@ -1,11 +1,34 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 from database.db_manager import DatabaseManager
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+_TS_FMT = '%Y-%m-%d %H:%M:%S'
+
+_REQUIRED_SIGNAL_FIELDS = ('symbol', 'open_price', 'ltp', 'prev_close', 'percentage_change')
+_get_required_signal_fields = itemgetter(*_REQUIRED_SIGNAL_FIELDS)
+
+@lru_cache(maxsize=4096, typed=True)
+def _signal_field_issue(symbol: Any, open_price: Any, ltp: Any, prev_close: Any, percentage_change: Any) -> Optional[str]:
+    """Value checks for a signal's required fields: the rejection reason, or None when they pass"""
+    if not symbol or not isinstance(symbol, str):
+        return f"Invalid symbol: {symbol}"
+    
+    for field, value in zip(_REQUIRED_SIGNAL_FIELDS[1:], (open_price, ltp, prev_close, percentage_change)):
+        if not isinstance(value, (int, float)) or value < 0:
+            return f"Invalid {field}: {value}"
+    
+    # Additional validation
+    if percentage_change < settings.MIN_PERCENTAGE_INCREASE:
+        return f"Percentage change {percentage_change} below minimum threshold"
+    
+    return None
+
 class LoggerAgent:
     """Agent responsible for logging stock signals to database"""
     
@@ -16,11 +39,22 @@ class LoggerAgent:
     
     def log_signals(self, filtered_stocks: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Log filtered stock signals to the database, overwriting previous signals."""
+        ts = datetime.now().strftime(_TS_FMT)
+        if not filtered_stocks:
+            # Quiet scan: keep the previous signals and skip the database write
+            logger.info("No signals to log - keeping previous signals")
+            return {
+                'total_processed': 0,
+                'successfully_logged': 0,
+                'failed': 0,
+                'success_rate': 0,
+                'timestamp': ts
+            }
+        
         try:
-            # Overwrite: clear all previous signals first
-            self.db_manager.clear_all_signals()
             logged_count = 0
             failed_count = 0
+            valid_signals = []
             for stock in filtered_stocks:
                 try:
                     signal_data = {
@@ -35,19 +69,24 @@ class LoggerAgent:
                         'source': stock.get('source', 'unknown')
                     }
                     if self._validate_signal_data(signal_data):
-                        if self.db_manager.insert_signal(signal_data):
-                            logged_count += 1
-                            self.logged_signals.append(signal_data)
-                            logger.debug(f"Logged signal for {signal_data['symbol']}")
-                        else:
-                            failed_count += 1
-                            logger.error(f"Failed to insert signal for {signal_data['symbol']}")
+                        valid_signals.append(signal_data)
                     else:
                         failed_count += 1
                         logger.warning(f"Invalid signal data for {stock.get('symbol', 'Unknown')}")
                 except Exception as e:
                     failed_count += 1
                     logger.error(f"Error processing signal for {stock.get('symbol', 'Unknown')}: {e}")
+            
+            # Overwrite: clear previous signals and insert the new ones atomically.
+            # A batch without a single valid row keeps the previous signals, like a quiet scan does
+            if not valid_signals:
+                logger.warning("No valid signals to log - keeping previous signals")
+            elif self.db_manager.replace_signals(valid_signals):
+                logged_count = len(valid_signals)
+                self.logged_signals.extend(valid_signals)
+            else:
+                failed_count += len(valid_signals)
+                logger.error(f"Failed to insert {len(valid_signals)} signals")
             total_signals = logged_count + failed_count
             success_rate = (logged_count / total_signals * 100) if total_signals > 0 else 0
             summary = {
@@ -55,7 +94,7 @@ class LoggerAgent:
                 'successfully_logged': logged_count,
                 'failed': failed_count,
                 'success_rate': round(success_rate, 2),
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'timestamp': ts
             }
             logger.info(f"Logging complete: {logged_count}/{total_signals} signals logged successfully ({success_rate:.1f}%)")
             return summary
@@ -67,34 +106,23 @@ class LoggerAgent:
                 'failed': len(filtered_stocks),
                 'success_rate': 0,
                 'error': str(e),
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'timestamp': ts
             }
     
     def _validate_signal_data(self, signal_data: Dict[str, Any]) -> bool:
         """Validate signal data before logging"""
         try:
             # Check required fields
-            required_fields = ['symbol', 'open_price', 'ltp', 'prev_close', 'percentage_change']
-            
-            for field in required_fields:
+            for field in _REQUIRED_SIGNAL_FIELDS:
                 if field not in signal_data:
                     logger.warning(f"Missing required field: {field}")
                     return False
-                
-                if field == 'symbol':
-                    if not signal_data[field] or not isinstance(signal_data[field], str):
-                        logger.warning(f"Invalid symbol: {signal_data[field]}")
-                        return False
-                else:
-                    if not isinstance(signal_data[field], (int, float)) or signal_data[field] < 0:
-                        logger.warning(f"Invalid {field}: {signal_data[field]}")
-                        return False
             
-            # Additional validation
-            if signal_data['percentage_change'] < settings.MIN_PERCENTAGE_INCREASE:
-                logger.warning(f"Percentage change {signal_data['percentage_change']} below minimum threshold")
+            # Rows repeat across scans, so the field checks are memoized on their values; the warning is not
+            issue = _signal_field_issue(*_get_required_signal_fields(signal_data))
+            if issue is not None:
+                logger.warning(issue)
                 return False
-            
             return True
             
         except Exception as e:
@@ -111,6 +139,7 @@ class LoggerAgent:
     
     def get_database_stats(self) -> Dict[str, Any]:
         """Get database statistics"""
+        ts = datetime.now().strftime(_TS_FMT)
         try:
             total_signals = self.db_manager.get_signal_count()
             recent_signals = len(self.db_manager.get_recent_signals(24))
@@ -119,7 +148,7 @@ class LoggerAgent:
                 'total_signals': total_signals,
                 'signals_last_24h': recent_signals,
                 'database_path': settings.DATABASE_PATH,
-                'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'last_updated': ts
             }
             
         except Exception as e:
@@ -128,7 +157,7 @@ class LoggerAgent:
                 'total_signals': 0,
                 'signals_last_24h': 0,
                 'error': str(e),
-                'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'last_updated': ts
             }
     
     def log_scan_session(self, session_data: Dict[str, Any]) -> bool:
@@ -136,7 +165,7 @@ class LoggerAgent:
         try:
             # Create session log entry
             session_log = {
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'timestamp': datetime.now().strftime(_TS_FMT),
                 'total_stocks_scanned': session_data.get('total_stocks', 0),
                 'stocks_filtered': session_data.get('filtered_count', 0),
                 'data_sources': session_data.get('sources', []),
@@ -1,24 +1,154 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import logging
 import time
 import random
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from urllib.parse import quote
 import warnings
-import re
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # optional fast JSON decoder
+    orjson = None
 
 # Suppress warnings
 warnings.filterwarnings("ignore", category=UserWarning, module='bs4')
 
 logger = logging.getLogger(__name__)
 
+# Previous-day OHLC does not change intraday; keep it per (symbol, date) for this many seconds
+HISTORICAL_CACHE_TTL = 1800
+
+# Parsed per-symbol quotes are reused for this many seconds, so back-to-back scans skip the round trips
+QUOTE_CACHE_TTL = 30
+
+# Per-symbol TTL caches prune expired entries once they reach this size
+SYMBOL_CACHE_MAX_ENTRIES = 1024
+
+# The F&O universe rarely changes intraday; a live NSE list is reused by every scraper for this many seconds
+FO_SYMBOLS_CACHE_TTL = 86400
+
+# Minimum spacing between nsetools quote requests issued from the worker pool
+NSE_TOOLS_REQUEST_INTERVAL = 0.2
+
+# Sustained spacing between per-symbol NSE scrapes (the old serial sleep averaged 0.55s),
+# with one scrape per pool worker allowed through at once
+NSE_SYMBOL_REQUEST_INTERVAL = 0.5
+NSE_SYMBOL_REQUEST_BURST = 5
+
+# Long-lived worker pool for concurrent source fetches, shared by every scraper and reused across scans.
+# Threads start lazily on first submit; one atexit hook shuts the pool down.
+_WORKER_POOL = ThreadPoolExecutor(max_workers=5, thread_name_prefix='nse-scraper')
+atexit.register(_WORKER_POOL.shutdown, wait=False)
+
+class _RateLimiter:
+    """Thread-safe token bucket: up to `burst` calls pass at once, then one per `interval` seconds"""
+    
+    def __init__(self, interval: float, burst: int = 1):
+        self.interval = interval
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) / self.interval)
+            self._last = now
+            if self._tokens < 1:
+                # Sleep only for the missing fraction of a token; waiters queue on the lock
+                time.sleep((1 - self._tokens) * self.interval)
+                self._tokens = 0.0
+                self._last = time.monotonic()
+            else:
+                self._tokens -= 1
+
+# Types accepted as numeric fields by the stock data validators
+_NUMBER_TYPES = (int, float)
+
+def _loads(content: bytes):
+    """Decode a JSON response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+@lru_cache(maxsize=8)
+def _historical_date_range(today: date) -> Tuple[str, str]:
+    """(from, to) dates for the NSE historical endpoint: the 10 days up to today, as DD-MM-YYYY"""
+    date_format = "%d-%m-%Y"
+    return (today - timedelta(days=10)).strftime(date_format), today.strftime(date_format)
+
+@lru_cache(maxsize=1024)
+def _url_symbol(symbol: str) -> str:
+    """Percent-encoded symbol for NSE query strings, encoded once per symbol"""
+    return quote(symbol)
+
+# Comprehensive known F&O universe, used as the fallback list and to filter broad index symbols
+_COMPREHENSIVE_FO_STOCKS: Tuple[str, ...] = (
+    'RELIANCE', 'TCS', 'HDFCBANK', 'INFY', 'HINDUNILVR', 'ICICIBANK',
+    'KOTAKBANK', 'SBIN', 'BHARTIARTL', 'ITC', 'ASIANPAINT', 'LT',
+    'AXISBANK', 'MARUTI', 'SUNPHARMA', 'ULTRACEMCO', 'TITAN', 'WIPRO',
+    'POWERGRID', 'NTPC', 'TATAMOTORS', 'ONGC', 'HCLTECH', 'BAJFINANCE', 
+    'M&M', 'TATASTEEL', 'COALINDIA', 'GRASIM', 'HINDALCO', 'JSWSTEEL', 
+    'INDUSINDBK', 'HEROMOTOCO', 'CIPLA', 'DRREDDY', 'EICHERMOT', 
+    'BAJAJFINSV', 'BRITANNIA', 'SHREECEM', 'DIVISLAB', 'BPCL',
+    'GODREJCP', 'DABUR', 'BANDHANBNK', 'BERGEPAINT', 'BIOCON',
+    'CANBK', 'CHOLAFIN', 'COLPAL', 'CONCOR', 'CUMMINSIND', 
+    'DLF', 'ESCORTS', 'EXIDEIND', 'FEDERALBNK', 'GAIL', 
+    'HAVELLS', 'HDFCLIFE', 'IDFCFIRSTB', 'IGL', 'INDIANB', 
+    'IOC', 'IRCTC', 'JINDALSTEL', 'JUBLFOOD', 'LICHSGFIN', 
+    'LUPIN', 'MARICO', 'MOTHERSUMI', 'MPHASIS', 'MRF', 
+    'NAUKRI', 'NMDC', 'OFSS', 'OIL', 'PAGEIND', 
+    'PEL', 'PETRONET', 'PFC', 'PNB', 'POLYCAB', 
+    'RAMCOCEM', 'RBLBANK', 'RECLTD', 'SAIL', 'SBILIFE', 
+    'SIEMENS', 'SRF', 'SRTRANSFIN', 'TORNTPHARM', 'TVSMOTOR', 
+    'UBL', 'VEDL', 'VOLTAS', 'YESBANK', 'ZEEL',
+    'ADANIGREEN', 'ADANIPORTS', 'AMBUJACEM', 'APOLLOHOSP',
+    'ASHOKLEY', 'ASTRAL', 'ATUL', 'AUBANK', 'AUROPHARMA',
+    'BALKRISIND', 'BANKINDIA', 'BATAINDIA', 'BEL', 'BHARATFORG',
+    'BHEL', 'BOSCHLTD', 'BSOFT', 'CANFINHOME', 'CHAMBLFERT', 
+    'COFORGE', 'COROMANDEL', 'CROMPTON', 'CUB', 'DEEPAKNTR', 
+    'DELTACORP', 'DMART', 'GLENMARK', 'GNFC', 'GRANULES', 
+    'GUJGASLTD', 'HINDPETRO', 'HONAUT', 'IBULHSGFIN', 'IDEA', 
+    'IDFC', 'INDIGO', 'INDIACEM', 'INDUSTOWER', 'INTELLECT', 
+    'IPCALAB', 'ISEC', 'JKCEMENT', 'JSWENERGY', 'JUSTDIAL', 
+    'KPITTECH', 'LAURUSLABS', 'LICI', 'LTTS', 'MANAPPURAM', 
+    'MAXHEALTH', 'METROPOLIS', 'MFSL', 'MINDTREE', 'NATIONALUM',
+    'NAVINFLUOR', 'NESTLEIND', 'OBEROIRLTY', 'PIIND', 'PIDILITIND', 
+    'PVRINOX', 'RAIN', 'RAJESHEXPO', 'RELAXO', 'SANOFI', 
+    'SCHAEFFLER', 'SEQUENT', 'SHYAMMETL', 'SHOPERSTOP', 'SOBHA', 
+    'STARHEALTH', 'SUNTV', 'SUPREMEIND', 'SYMPHONY', 'TECHM', 
+    'TIINDIA', 'TRIDENT', 'TRENT', 'TTKPRESTIG', 'UJJIVAN', 
+    'UNIONBANK', 'UPL', 'VGUARD', 'VINATIORGA', 'WHIRLPOOL', 'ZYDUSLIFE'
+)
+_COMPREHENSIVE_FO_SET = frozenset(_COMPREHENSIVE_FO_STOCKS)
+
 class RobustNSEScraper:
     """Ultra-robust NSE scraper that bypasses all security measures"""
     
+    # Last live F&O list as (monotonic fetch time, symbols), shared across instances
+    _fo_cache: Tuple[float, Tuple[str, ...]] = (0.0, ())
+    _fo_cache_lock = threading.Lock()
+    
     def __init__(self):
         self.session = requests.Session()
+        # Keep-alive pool sized for the worker pool, with retries on transient NSE errors;
+        # statuses are still returned to the callers once retries run out
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504], raise_on_status=False)
+        )
+        self.session.mount("https://", adapter)
         self.base_url = "https://www.nseindia.com"
         self.cookies_established = False
         self.last_session_time = 0
@@ -46,6 +176,45 @@ class RobustNSEScraper:
             'Cache-Control': 'max-age=0',
         }
         
+        # Headers for JSON API calls and per-symbol endpoint prefixes, built once per scraper
+        self.api_headers = {
+            **self.base_headers,
+            'Accept': 'application/json, text/plain, */*',
+            'Referer': f'{self.base_url}/',
+            'Sec-Fetch-Dest': 'empty',
+            'Sec-Fetch-Mode': 'cors',
+            'Sec-Fetch-Site': 'same-origin'
+        }
+        self._quote_equity_url = f"{self.base_url}/api/quote-equity?symbol="
+        self._quote_derivative_url = f"{self.base_url}/api/quote-derivative?symbol="
+        self._search_url = f"{self.base_url}/api/search/autocomplete?q="
+        self._historical_url = f"{self.base_url}/api/historical/cm/equity?symbol="
+        self._nifty500_url = f"{self.base_url}/api/equity-stockIndices?index=NIFTY%20500"
+        
+        # Known F&O universe as a set for O(1) membership checks
+        self._known_fo_set = _COMPREHENSIVE_FO_SET
+        
+        # Concurrent source fetches run on the shared module-level worker pool
+        self._pool = _WORKER_POOL
+        
+        # NIFTY 500 rows keyed by symbol, fetched at most once per get_stock_data_robust run
+        self._nifty500_quotes = None
+        self._nifty500_lock = threading.Lock()
+        
+        # Paces the per-symbol scrapes now that several run at once on the pool
+        self._symbol_limiter = _RateLimiter(NSE_SYMBOL_REQUEST_INTERVAL, NSE_SYMBOL_REQUEST_BURST)
+        
+        # symbol -> (expiry, parsed stock data) for recently scraped quotes
+        self._quote_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._quote_lock = threading.Lock()
+        
+        # (symbol, date) -> (expiry, historical data); shared by the pool workers, hence the lock
+        self._hist_cache: Dict[Tuple[str, date], Tuple[float, Dict[str, Any]]] = {}
+        self._hist_lock = threading.Lock()
+        
+        # (index, known_only) -> (ETag, symbols) for conditional re-fetches of index constituents
+        self._index_etags: Dict[Tuple[str, bool], Tuple[str, List[str]]] = {}
+        
         self._update_headers()
         logger.info("🔧 Robust NSE Scraper initialized")
     
@@ -139,7 +308,7 @@ class RobustNSEScraper:
                 response = self.session.get(url, timeout=10)
                 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = _loads(response.content)
                     if 'data' in data:
                         logger.debug("✅ API access confirmed")
                         return True
@@ -153,16 +322,7 @@ class RobustNSEScraper:
         """Direct API warmup without homepage"""
         try:
             # Update headers for API calls
-            api_headers = self.base_headers.copy()
-            api_headers.update({
-                'Accept': 'application/json, text/plain, */*',
-                'Referer': f'{self.base_url}/',
-                'Sec-Fetch-Dest': 'empty',
-                'Sec-Fetch-Mode': 'cors',
-                'Sec-Fetch-Site': 'same-origin'
-            })
-            
-            self.session.headers.update(api_headers)
+            self.session.headers.update(self.api_headers)
             
             # Test with a simple API call
             response = self.session.get(f"{self.base_url}/api/allIndices", timeout=10)
@@ -177,83 +337,128 @@ class RobustNSEScraper:
             logger.debug(f"⚠️ Direct API warmup failed: {e}")
             return False
     
+    def _get_json(self, url: str, timeout: int) -> Optional[Any]:
+        """GET a JSON endpoint; None on network errors, non-200 responses or an undecodable body"""
+        try:
+            response = self.session.get(url, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"⚠️ Request failed for {url}: {e}")
+            return None
+        
+        if response.status_code != 200:
+            return None
+        
+        try:
+            return _loads(response.content)
+        except ValueError:
+            logger.debug(f"⚠️ Invalid JSON from {url}")
+            return None
+    
+    def _fetch_index_symbols(self, index: str, known_only: bool = False) -> List[str]:
+        """Fetch constituent symbols of an NSE index, revalidating a previous response by its ETag"""
+        symbols = []
+        url = f"{self.base_url}/api/equity-stockIndices?index={index}"
+        key = (index, known_only)
+        cached = self._index_etags.get(key)
+        headers = {'If-None-Match': cached[0]} if cached else None
+        response = self.session.get(url, timeout=15, headers=headers)
+        
+        if response.status_code == 304 and cached:
+            return list(cached[1])
+        
+        if response.status_code == 200:
+            data = _loads(response.content)
+            if 'data' in data:
+                # Broad indices: keep only known F&O stocks; bound once outside the row loop
+                known = self._known_fo_set if known_only else None
+                for item in data['data']:
+                    symbol = item.get('symbol', '').strip()
+                    if symbol and len(symbol) >= 2:
+                        if known is not None and symbol not in known:
+                            continue
+                        symbols.append(symbol)
+            
+            etag = response.headers.get('ETag')
+            if etag and symbols:
+                self._index_etags[key] = (etag, symbols)
+        
+        return symbols
+    
+    def _fetch_preopen_fo_symbols(self) -> List[str]:
+        """Fetch F&O symbols from the pre-open market data"""
+        symbols = []
+        url = f"{self.base_url}/api/market-data-pre-open?key=FO"
+        response = self.session.get(url, timeout=15)
+        
+        if response.status_code == 200:
+            data = _loads(response.content)
+            if 'data' in data:
+                for item in data['data']:
+                    if 'metadata' in item:
+                        symbol = item['metadata'].get('symbol', '').strip()
+                    else:
+                        symbol = item.get('symbol', '').strip()
+                    
+                    if symbol and len(symbol) >= 2:
+                        symbols.append(symbol)
+        
+        return symbols
+    
     def get_fo_stocks_robust(self) -> List[str]:
+        """Get F&O stocks, reusing a live list fetched by any scraper within FO_SYMBOLS_CACHE_TTL"""
+        cached = self._cached_fo_stocks()
+        if cached is not None:
+            return cached
+        
+        # One fetch at a time, so concurrent callers on a cold cache wait for it instead of repeating it
+        with RobustNSEScraper._fo_cache_lock:
+            cached = self._cached_fo_stocks()
+            if cached is not None:
+                return cached
+            return self._fetch_fo_stocks_robust()
+    
+    def _cached_fo_stocks(self) -> Optional[List[str]]:
+        """The shared F&O list if it is still fresh, else None"""
+        fetched_at, symbols = RobustNSEScraper._fo_cache
+        if symbols and time.monotonic() - fetched_at < FO_SYMBOLS_CACHE_TTL:
+            return list(symbols)
+        return None
+    
+    def _fetch_fo_stocks_robust(self) -> List[str]:
         """Get F&O stocks using multiple robust methods"""
         try:
-            all_symbols = set()
+            # Insertion-ordered dedup: O(1) membership like a set, but a stable symbol order across runs
+            all_symbols: Dict[str, None] = {}
             
             if not self._establish_robust_session():
                 logger.warning("⚠️ Could not establish NSE session, using fallback list")
                 return self._get_comprehensive_fo_list()
             
-            # Method 1: F&O Index endpoint
-            try:
-                url = f"{self.base_url}/api/equity-stockIndices?index=SECURITIES%20IN%20F%26O"
-                response = self.session.get(url, timeout=15)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if 'data' in data:
-                        for item in data['data']:
-                            symbol = item.get('symbol', '').strip()
-                            if symbol and len(symbol) >= 2:
-                                all_symbols.add(symbol)
-                        logger.info(f"✅ F&O Index: {len(all_symbols)} symbols")
-                
-            except Exception as e:
-                logger.debug(f"⚠️ F&O index failed: {e}")
-            
-            # Method 2: Market data pre-open
-            try:
-                time.sleep(1)
-                url = f"{self.base_url}/api/market-data-pre-open?key=FO"
-                response = self.session.get(url, timeout=15)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if 'data' in data:
-                        for item in data['data']:
-                            if 'metadata' in item:
-                                symbol = item['metadata'].get('symbol', '').strip()
-                            else:
-                                symbol = item.get('symbol', '').strip()
-                            
-                            if symbol and len(symbol) >= 2:
-                                all_symbols.add(symbol)
-                
-            except Exception as e:
-                logger.debug(f"⚠️ Pre-open F&O failed: {e}")
-            
-            # Method 3: Alternative indices
-            indices = [
-                "NIFTY%20F%26O",
-                "NIFTY%20500", 
-                "NIFTY%20200"
+            # F&O index, pre-open market data, and broad indices filtered to known F&O names
+            sources = [
+                ("F&O Index", self._fetch_index_symbols, ("SECURITIES%20IN%20F%26O",)),
+                ("Pre-open F&O", self._fetch_preopen_fo_symbols, ()),
+                ("Index NIFTY%20F%26O", self._fetch_index_symbols, ("NIFTY%20F%26O", True)),
+                ("Index NIFTY%20500", self._fetch_index_symbols, ("NIFTY%20500", True)),
+                ("Index NIFTY%20200", self._fetch_index_symbols, ("NIFTY%20200", True)),
             ]
             
-            for index in indices:
+            # The sources are independent, so query them concurrently; merge in source priority order
+            futures = [(name, self._pool.submit(fetch, *args)) for name, fetch, args in sources]
+            
+            for name, future in futures:
                 try:
-                    time.sleep(1)
-                    url = f"{self.base_url}/api/equity-stockIndices?index={index}"
-                    response = self.session.get(url, timeout=15)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        if 'data' in data:
-                            for item in data['data']:
-                                symbol = item.get('symbol', '').strip()
-                                if symbol and len(symbol) >= 2:
-                                    # Filter only known F&O stocks
-                                    if symbol in self._get_comprehensive_fo_list():
-                                        all_symbols.add(symbol)
-                    
+                    symbols = future.result()
+                    all_symbols.update(dict.fromkeys(symbols))
+                    logger.debug(f"✅ {name}: {len(symbols)} symbols")
                 except Exception as e:
-                    logger.debug(f"⚠️ Index {index} failed: {e}")
-                    continue
+                    logger.debug(f"⚠️ {name} failed: {e}")
             
             if all_symbols:
                 symbols_list = list(all_symbols)
                 logger.info(f"✅ Total F&O symbols collected: {len(symbols_list)}")
+                # Only a live NSE list is shared; fallbacks are retried on the next call
+                RobustNSEScraper._fo_cache = (time.monotonic(), tuple(symbols_list))
                 return symbols_list
             else:
                 logger.warning("⚠️ No symbols from NSE, using comprehensive list")
@@ -266,54 +471,65 @@ class RobustNSEScraper:
     def get_stock_data_robust(self, symbols: List[str]) -> List[Dict[str, Any]]:
         """Get real stock data using multiple robust methods"""
         try:
-            if not self._establish_robust_session():
-                logger.error("❌ Cannot establish NSE session for data fetch")
-                return []
-            
-            real_stock_data = []
-            success_count = 0
-            
-            # Process symbols in batches
-            batch_size = 5
-            for i in range(0, min(len(symbols), 30), batch_size):
-                batch = symbols[i:i + batch_size]
-                
-                for symbol in batch:
-                    try:
-                        time.sleep(random.uniform(0.3, 0.8))  # Rate limiting
-                        
-                        stock_data = self._get_individual_stock_data(symbol)
-                        
-                        if stock_data and self._validate_real_stock_data(stock_data):
-                            real_stock_data.append(stock_data)
-                            success_count += 1
-                            logger.debug(f"✅ {symbol}: ₹{stock_data['ltp']:.2f}")
-                        
-                    except Exception as e:
-                        logger.debug(f"⚠️ {symbol} failed: {e}")
-                        continue
-                
-                # Pause between batches
-                if i + batch_size < len(symbols):
-                    time.sleep(random.uniform(1, 2))
-            
-            logger.info(f"✅ Real data fetched for {success_count} stocks")
+            real_stock_data = list(self.iter_stock_data_robust(symbols))
+            logger.info(f"✅ Real data fetched for {len(real_stock_data)} stocks")
             return real_stock_data
             
         except Exception as e:
             logger.error(f"❌ Stock data fetch failed: {e}")
             return []
     
+    def iter_stock_data_robust(self, symbols: List[str]) -> Iterator[Dict[str, Any]]:
+        """Yield validated stock data in symbol order as soon as each symbol's scrape completes"""
+        if not self._establish_robust_session():
+            logger.error("❌ Cannot establish NSE session for data fetch")
+            return
+        
+        self._nifty500_quotes = None
+        
+        # Each symbol is several blocking round-trips, so fan them out over the worker pool;
+        # the limiter paces request starts. How many symbols to scrape is up to the caller.
+        results = self._pool.map(self._get_individual_stock_data_paced, symbols)
+        
+        for symbol, stock_data in zip(symbols, results):
+            if stock_data and self._validate_real_stock_data(stock_data):
+                logger.debug(f"✅ {symbol}: ₹{stock_data['ltp']:.2f}")
+                yield stock_data
+    
+    def _get_individual_stock_data_paced(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """_get_individual_stock_data behind the quote cache and the shared rate limiter, None on failure"""
+        with self._quote_lock:
+            hit = self._quote_cache.get(symbol)
+        if hit is not None and hit[0] > time.monotonic():
+            return dict(hit[1])
+        
+        try:
+            self._symbol_limiter.wait()  # Rate limiting
+            stock_data = self._get_individual_stock_data(symbol)
+        except Exception as e:
+            logger.debug(f"⚠️ {symbol} failed: {e}")
+            return None
+        
+        if stock_data:
+            now = time.monotonic()
+            with self._quote_lock:
+                if len(self._quote_cache) >= SYMBOL_CACHE_MAX_ENTRIES:
+                    self._quote_cache = {k: v for k, v in self._quote_cache.items() if v[0] > now}
+                self._quote_cache[symbol] = (now + QUOTE_CACHE_TTL, dict(stock_data))
+        return stock_data
+    
     def _get_individual_stock_data(self, symbol: str) -> Dict[str, Any]:
         """Get individual stock data using multiple endpoints"""
         
         # Method 1: Quote equity endpoint
+        fetched_url = None
         try:
-            url = f"{self.base_url}/api/quote-equity?symbol={quote(symbol)}"
+            url = self._quote_equity_url + _url_symbol(symbol)
             response = self.session.get(url, timeout=12)
             
             if response.status_code == 200:
-                data = response.json()
+                fetched_url = url
+                data = _loads(response.content)
                 
                 if 'priceInfo' in data:
                     stock_data = self._parse_quote_equity_data(symbol, data)
@@ -327,7 +543,7 @@ class RobustNSEScraper:
         try:
             search_data = self._search_symbol(symbol)
             if search_data:
-                quote_data = self._get_quote_from_search(search_data)
+                quote_data = self._get_quote_from_search(search_data, fetched_url)
                 if quote_data:
                     return quote_data
             
@@ -363,31 +579,8 @@ class RobustNSEScraper:
             if 'marketDeptOrderBook' in data:
                 volume = int(data['marketDeptOrderBook'].get('totalTradedVolume', 0))
             
-            # Get historical data for previous day
-            hist_data = self._get_historical_data_robust(symbol)
-            
-            stock_data = {
-                'symbol': symbol,
-                'ltp': ltp,
-                'open_price': open_price,
-                'high_price': day_high,
-                'low_price': day_low,
-                'prev_close': prev_close,
-                'prev_day_high': hist_data.get('prev_day_high', prev_close),
-                'prev_day_open': hist_data.get('prev_day_open', prev_close),
-                'prev_day_low': hist_data.get('prev_day_low', prev_close),
-                'volume': volume,
-                'change_in_oi': 0,
-                'total_oi': 0,
-                'source': 'nse_quote_equity_real'
-            }
-            
-            # Try to get F&O data
-            fo_data = self._get_fo_data_robust(symbol)
-            if fo_data:
-                stock_data.update(fo_data)
-            
-            return stock_data
+            return self._build_stock_data(symbol, ltp, open_price, day_high, day_low, prev_close, volume,
+                                          'nse_quote_equity_real', with_fo=True)
             
         except Exception as e:
             logger.debug(f"⚠️ Parse quote equity failed for {symbol}: {e}")
@@ -395,43 +588,36 @@ class RobustNSEScraper:
     
     def _search_symbol(self, symbol: str) -> Dict:
         """Search for symbol to get exact match"""
-        try:
-            url = f"{self.base_url}/api/search/autocomplete?q={quote(symbol)}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if 'symbols' in data:
-                    for item in data['symbols']:
-                        if item.get('symbol', '').upper() == symbol.upper():
-                            return item
-                            
-        except Exception as e:
-            logger.debug(f"⚠️ Symbol search failed for {symbol}: {e}")
+        url = self._search_url + _url_symbol(symbol)
+        data = self._get_json(url, 10)
+        if not isinstance(data, dict):
+            return None
+        
+        target = symbol.upper()
+        for item in data.get('symbols', ()):
+            if isinstance(item, dict) and str(item.get('symbol', '')).upper() == target:
+                return item
         
         return None
     
-    def _get_quote_from_search(self, search_data: Dict) -> Dict[str, Any]:
-        """Get quote data from search result"""
+    def _get_quote_from_search(self, search_data: Dict, fetched_url: Optional[str] = None) -> Dict[str, Any]:
+        """Get quote data from search result, skipping the endpoint already fetched by the caller"""
         try:
             symbol = search_data.get('symbol', '')
             if not symbol:
                 return None
             
             # Try different quote endpoints
-            endpoints = [
-                f"/api/quote-equity?symbol={quote(symbol)}",
-                f"/api/quote-equity?symbol={quote(symbol)}&section=trade_info"
-            ]
+            quote_url = self._quote_equity_url + _url_symbol(symbol)
             
-            for endpoint in endpoints:
+            for url in (quote_url, quote_url + "&section=trade_info"):
+                if url == fetched_url:
+                    continue
                 try:
-                    url = f"{self.base_url}{endpoint}"
                     response = self.session.get(url, timeout=10)
                     
                     if response.status_code == 200:
-                        data = response.json()
+                        data = _loads(response.content)
                         return self._parse_quote_equity_data(symbol, data)
                 
                 except Exception:
@@ -447,16 +633,9 @@ class RobustNSEScraper:
         """Alternative quote methods"""
         try:
             # Method: Check if symbol is in market data
-            url = f"{self.base_url}/api/equity-stockIndices?index=NIFTY%20500"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if 'data' in data:
-                    for item in data['data']:
-                        if item.get('symbol', '').upper() == symbol.upper():
-                            return self._parse_market_index_data(symbol, item)
+            item = self._get_nifty500_quotes().get(symbol.upper())
+            if item is not None:
+                return self._parse_market_index_data(symbol, item)
             
             return None
             
@@ -464,6 +643,28 @@ class RobustNSEScraper:
             logger.debug(f"⚠️ Alternative quote failed for {symbol}: {e}")
             return None
     
+    def _get_nifty500_quotes(self) -> Dict[str, Dict]:
+        """NIFTY 500 market data keyed by upper-cased symbol, one request shared by every symbol in a run"""
+        if self._nifty500_quotes is not None:
+            return self._nifty500_quotes
+        
+        # Pool workers that miss together wait for the one request instead of each making it
+        with self._nifty500_lock:
+            if self._nifty500_quotes is not None:
+                return self._nifty500_quotes
+            
+            quotes = {}
+            response = self.session.get(self._nifty500_url, timeout=10)
+            
+            if response.status_code == 200:
+                data = _loads(response.content)
+                for item in data.get('data', []):
+                    quotes.setdefault(item.get('symbol', '').upper(), item)
+                # Only a successful response is reused; failures are retried by the next symbol
+                self._nifty500_quotes = quotes
+            
+            return quotes
+    
     def _parse_market_index_data(self, symbol: str, data: Dict) -> Dict[str, Any]:
         """Parse market index data"""
         try:
@@ -474,177 +675,138 @@ class RobustNSEScraper:
             day_low = float(data.get('dayLow', ltp))
             volume = int(data.get('totalTradedVolume', 0))
             
-            # Get historical data
-            hist_data = self._get_historical_data_robust(symbol)
-            
-            return {
-                'symbol': symbol,
-                'ltp': ltp,
-                'open_price': open_price,
-                'high_price': day_high,
-                'low_price': day_low,
-                'prev_close': prev_close,
-                'prev_day_high': hist_data.get('prev_day_high', prev_close),
-                'prev_day_open': hist_data.get('prev_day_open', prev_close),
-                'prev_day_low': hist_data.get('prev_day_low', prev_close),
-                'volume': volume,
-                'change_in_oi': 0,
-                'total_oi': 0,
-                'source': 'nse_market_index_real'
-            }
+            return self._build_stock_data(symbol, ltp, open_price, day_high, day_low, prev_close, volume,
+                                          'nse_market_index_real')
             
         except Exception as e:
             logger.debug(f"⚠️ Parse market index failed for {symbol}: {e}")
             return None
     
+    def _build_stock_data(self, symbol: str, ltp: float, open_price: float, day_high: float, day_low: float,
+                          prev_close: float, volume: int, source: str, with_fo: bool = False) -> Dict[str, Any]:
+        """Stock dict shared by every quote source: previous-day OHLC from history, optionally F&O OI"""
+        hist_data = self._get_historical_data_robust(symbol)
+        
+        stock_data = {
+            'symbol': symbol,
+            'ltp': ltp,
+            'open_price': open_price,
+            'high_price': day_high,
+            'low_price': day_low,
+            'prev_close': prev_close,
+            'prev_day_high': hist_data.get('prev_day_high', prev_close),
+            'prev_day_open': hist_data.get('prev_day_open', prev_close),
+            'prev_day_low': hist_data.get('prev_day_low', prev_close),
+            'volume': volume,
+            'change_in_oi': 0,
+            'total_oi': 0,
+            'source': source
+        }
+        
+        if with_fo:
+            fo_data = self._get_fo_data_robust(symbol)
+            if fo_data:
+                stock_data.update(fo_data)
+        
+        return stock_data
+    
     def _get_historical_data_robust(self, symbol: str) -> Dict[str, Any]:
-        """Get historical data with multiple fallback methods"""
+        """Get historical data, served from the per-day cache when fetched recently"""
+        key = (symbol, date.today())
+        now = time.monotonic()
+        with self._hist_lock:
+            hit = self._hist_cache.get(key)
+        if hit is not None and hit[0] > now:
+            return hit[1]
+        
+        hist_data = self._fetch_historical_data(symbol)
+        if hist_data:
+            with self._hist_lock:
+                if len(self._hist_cache) >= SYMBOL_CACHE_MAX_ENTRIES:
+                    self._hist_cache = {k: v for k, v in self._hist_cache.items() if v[0] > now}
+                self._hist_cache[key] = (now + HISTORICAL_CACHE_TTL, hist_data)
+        return hist_data
+    
+    def _fetch_historical_data(self, symbol: str) -> Dict[str, Any]:
+        """Get previous trading day OHLC from the historical CM equity endpoint"""
+        from_date, to_date = _historical_date_range(date.today())
+        url = f"{self._historical_url}{_url_symbol(symbol)}&series=[%22EQ%22]&from={from_date}&to={to_date}"
+        
+        data = self._get_json(url, 15)
+        if not isinstance(data, dict) or len(data.get('data') or ()) < 2:
+            return {}
+        
+        # Get previous trading day data
+        prev_day = data['data'][-2]
         try:
-            # Method 1: Historical CM equity endpoint
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=10)
-            
-            date_format = "%d-%m-%Y"
-            from_date = start_date.strftime(date_format)
-            to_date = end_date.strftime(date_format)
-            
-            url = f"{self.base_url}/api/historical/cm/equity?symbol={quote(symbol)}&series=[%22EQ%22]&from={from_date}&to={to_date}"
-            
-            response = self.session.get(url, timeout=15)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if 'data' in data and len(data['data']) >= 2:
-                    # Get previous trading day data
-                    prev_day = data['data'][-2]
-                    
-                    return {
-                        'prev_day_high': float(prev_day.get('CH_TRADE_HIGH_PRICE', 0)),
-                        'prev_day_open': float(prev_day.get('CH_OPENING_PRICE', 0)),
-                        'prev_day_low': float(prev_day.get('CH_TRADE_LOW_PRICE', 0)),
-                        'prev_day_close': float(prev_day.get('CH_CLOSING_PRICE', 0))
-                    }
-            
-        except Exception as e:
+            return {
+                'prev_day_high': float(prev_day.get('CH_TRADE_HIGH_PRICE', 0)),
+                'prev_day_open': float(prev_day.get('CH_OPENING_PRICE', 0)),
+                'prev_day_low': float(prev_day.get('CH_TRADE_LOW_PRICE', 0)),
+                'prev_day_close': float(prev_day.get('CH_CLOSING_PRICE', 0))
+            }
+        except (AttributeError, TypeError, ValueError) as e:
             logger.debug(f"⚠️ Historical data failed for {symbol}: {e}")
-        
-        return {}
+            return {}
     
     def _get_fo_data_robust(self, symbol: str) -> Dict[str, Any]:
         """Get F&O data including OI with robust methods"""
+        url = self._quote_derivative_url + _url_symbol(symbol)
+        data = self._get_json(url, 10)
+        if not isinstance(data, dict):
+            return {'total_oi': 0, 'change_in_oi': 0}
+        
         try:
-            # F&O quote endpoint
-            url = f"{self.base_url}/api/quote-derivative?symbol={quote(symbol)}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Parse F&O data from different structures
-                if 'stocks' in data:
-                    for stock_info in data['stocks']:
-                        if 'metadata' in stock_info:
-                            metadata = stock_info['metadata']
-                            
-                            if 'Futures' in metadata.get('instrumentType', ''):
-                                oi = int(metadata.get('openInterest', 0))
-                                prev_oi = int(metadata.get('prevOI', 0))
-                                change_oi = oi - prev_oi if prev_oi > 0 else 0
-                                
-                                if oi > 0:
-                                    return {
-                                        'total_oi': oi,
-                                        'change_in_oi': change_oi
-                                    }
-                
-                # Alternative structure
-                if 'data' in data:
-                    for item in data['data']:
-                        if 'FUT' in item.get('instrumentType', '').upper():
-                            oi = int(item.get('openInterest', 0))
-                            prev_oi = int(item.get('prevOI', 0))
-                            change_oi = oi - prev_oi if prev_oi > 0 else 0
-                            
-                            if oi > 0:
-                                return {
-                                    'total_oi': oi,
-                                    'change_in_oi': change_oi
-                                }
+            # Parse F&O data from different structures
+            for stock_info in data.get('stocks', ()):
+                if 'metadata' in stock_info:
+                    metadata = stock_info['metadata']
+                    
+                    if 'Futures' in metadata.get('instrumentType', ''):
+                        oi = int(metadata.get('openInterest', 0))
+                        prev_oi = int(metadata.get('prevOI', 0))
+                        change_oi = oi - prev_oi if prev_oi > 0 else 0
+                        
+                        if oi > 0:
+                            return {
+                                'total_oi': oi,
+                                'change_in_oi': change_oi
+                            }
+            
+            # Alternative structure
+            for item in data.get('data', ()):
+                if 'FUT' in item.get('instrumentType', '').upper():
+                    oi = int(item.get('openInterest', 0))
+                    prev_oi = int(item.get('prevOI', 0))
+                    change_oi = oi - prev_oi if prev_oi > 0 else 0
+                    
+                    if oi > 0:
+                        return {
+                            'total_oi': oi,
+                            'change_in_oi': change_oi
+                        }
             
-        except Exception as e:
+        except (AttributeError, TypeError, ValueError) as e:
             logger.debug(f"⚠️ F&O data failed for {symbol}: {e}")
         
         return {'total_oi': 0, 'change_in_oi': 0}
     
     def _validate_real_stock_data(self, stock_data: Dict[str, Any]) -> bool:
         """Validate that we have real stock data"""
-        try:
-            required_fields = ['symbol', 'ltp', 'prev_close']
-            
-            for field in required_fields:
-                value = stock_data.get(field, 0)
-                if not isinstance(value, (int, float)) or value <= 0:
-                    return False
-            
-            # Additional validations
-            ltp = stock_data['ltp']
-            prev_close = stock_data['prev_close']
-            
-            # Price range check
-            if not (1 <= ltp <= 100000):
-                return False
-            
-            # Change check
-            if prev_close > 0:
-                change = abs((ltp - prev_close) / prev_close)
-                if change > 0.5:  # Max 50% change
-                    return False
-            
-            return True
-            
-        except Exception:
-            return False
+        symbol = stock_data.get('symbol', 0)
+        ltp = stock_data.get('ltp', 0)
+        prev_close = stock_data.get('prev_close', 0)
+        
+        # Required fields are positive numbers, price in range, change at most 50%
+        return (isinstance(symbol, _NUMBER_TYPES) and symbol > 0 and
+                isinstance(ltp, _NUMBER_TYPES) and ltp > 0 and
+                isinstance(prev_close, _NUMBER_TYPES) and prev_close > 0 and
+                1 <= ltp <= 100000 and
+                abs((ltp - prev_close) / prev_close) <= 0.5)
     
     def _get_comprehensive_fo_list(self) -> List[str]:
         """Comprehensive F&O stocks list as fallback"""
-        return [
-            'RELIANCE', 'TCS', 'HDFCBANK', 'INFY', 'HINDUNILVR', 'ICICIBANK',
-            'KOTAKBANK', 'SBIN', 'BHARTIARTL', 'ITC', 'ASIANPAINT', 'LT',
-            'AXISBANK', 'MARUTI', 'SUNPHARMA', 'ULTRACEMCO', 'TITAN', 'WIPRO',
-            'POWERGRID', 'NTPC', 'TATAMOTORS', 'ONGC', 'HCLTECH', 'BAJFINANCE', 
-            'M&M', 'TATASTEEL', 'COALINDIA', 'GRASIM', 'HINDALCO', 'JSWSTEEL', 
-            'INDUSINDBK', 'HEROMOTOCO', 'CIPLA', 'DRREDDY', 'EICHERMOT', 
-            'BAJAJFINSV', 'BRITANNIA', 'SHREECEM', 'DIVISLAB', 'BPCL',
-            'GODREJCP', 'DABUR', 'BANDHANBNK', 'BERGEPAINT', 'BIOCON',
-            'CANBK', 'CHOLAFIN', 'COLPAL', 'CONCOR', 'CUMMINSIND', 
-            'DLF', 'ESCORTS', 'EXIDEIND', 'FEDERALBNK', 'GAIL', 
-            'HAVELLS', 'HDFCLIFE', 'IDFCFIRSTB', 'IGL', 'INDIANB', 
-            'IOC', 'IRCTC', 'JINDALSTEL', 'JUBLFOOD', 'LICHSGFIN', 
-            'LUPIN', 'MARICO', 'MOTHERSUMI', 'MPHASIS', 'MRF', 
-            'NAUKRI', 'NMDC', 'OFSS', 'OIL', 'PAGEIND', 
-            'PEL', 'PETRONET', 'PFC', 'PNB', 'POLYCAB', 
-            'RAMCOCEM', 'RBLBANK', 'RECLTD', 'SAIL', 'SBILIFE', 
-            'SIEMENS', 'SRF', 'SRTRANSFIN', 'TORNTPHARM', 'TVSMOTOR', 
-            'UBL', 'VEDL', 'VOLTAS', 'YESBANK', 'ZEEL',
-            'ADANIGREEN', 'ADANIPORTS', 'AMBUJACEM', 'APOLLOHOSP',
-            'ASHOKLEY', 'ASTRAL', 'ATUL', 'AUBANK', 'AUROPHARMA',
-            'BALKRISIND', 'BANKINDIA', 'BATAINDIA', 'BEL', 'BHARATFORG',
-            'BHEL', 'BOSCHLTD', 'BSOFT', 'CANFINHOME', 'CHAMBLFERT', 
-            'COFORGE', 'COROMANDEL', 'CROMPTON', 'CUB', 'DEEPAKNTR', 
-            'DELTACORP', 'DMART', 'GLENMARK', 'GNFC', 'GRANULES', 
-            'GUJGASLTD', 'HINDPETRO', 'HONAUT', 'IBULHSGFIN', 'IDEA', 
-            'IDFC', 'INDIGO', 'INDIACEM', 'INDUSTOWER', 'INTELLECT', 
-            'IPCALAB', 'ISEC', 'JKCEMENT', 'JSWENERGY', 'JUSTDIAL', 
-            'KPITTECH', 'LAURUSLABS', 'LICI', 'LTTS', 'MANAPPURAM', 
-            'MAXHEALTH', 'METROPOLIS', 'MFSL', 'MINDTREE', 'NATIONALUM',
-            'NAVINFLUOR', 'NESTLEIND', 'OBEROIRLTY', 'PIIND', 'PIDILITIND', 
-            'PVRINOX', 'RAIN', 'RAJESHEXPO', 'RELAXO', 'SANOFI', 
-            'SCHAEFFLER', 'SEQUENT', 'SHYAMMETL', 'SHOPERSTOP', 'SOBHA', 
-            'STARHEALTH', 'SUNTV', 'SUPREMEIND', 'SYMPHONY', 'TECHM', 
-            'TIINDIA', 'TRIDENT', 'TRENT', 'TTKPRESTIG', 'UJJIVAN', 
-            'UNIONBANK', 'UPL', 'VGUARD', 'VINATIORGA', 'WHIRLPOOL', 'ZYDUSLIFE'
-        ]
+        return list(_COMPREHENSIVE_FO_STOCKS)
 
 
 class EnhancedYFinanceClient:
@@ -672,16 +834,9 @@ class EnhancedYFinanceClient:
             
             logger.info(f"📊 Fetching YFinance data for {len(valid_symbols)} symbols...")
             
-            # Process in smaller batches for reliability
-            batch_size = 10
-            for i in range(0, len(valid_symbols), batch_size):
-                batch = valid_symbols[i:i + batch_size]
-                batch_data = self._process_batch(batch)
-                real_data.extend(batch_data)
-                
-                # Rate limiting
-                if i + batch_size < len(valid_symbols):
-                    time.sleep(1)
+            # Daily history comes from one bulk download, so process the
+            # whole list as a single batch instead of 10-symbol chunks
+            real_data = self._process_batch(valid_symbols)
             
             logger.info(f"✅ YFinance: Retrieved data for {len(real_data)} stocks")
             return real_data
@@ -692,25 +847,57 @@ class EnhancedYFinanceClient:
     
     def _process_batch(self, symbols: List[str]) -> List[Dict[str, Any]]:
         """Process a batch of symbols"""
-        batch_data = []
+        history = self._download_history(symbols) or {}
         
-        for symbol in symbols:
-            try:
-                stock_data = self._get_individual_stock_data(symbol)
-                if stock_data and self._validate_yfinance_data(stock_data):
-                    batch_data.append(stock_data)
-                else:
-                    self.failed_symbols.add(symbol)
-                    
-            except Exception as e:
-                logger.debug(f"⚠️ YFinance {symbol} failed: {e}")
+        # Symbols missing from the bulk download fall back to a per-ticker history request. ticker.info is
+        # still one request per symbol, so those calls overlap on the worker pool instead of running serially
+        results = _WORKER_POOL.map(self._get_individual_stock_data, symbols, [history.get(s) for s in symbols])
+        
+        batch_data = []
+        for symbol, stock_data in zip(symbols, results):
+            if stock_data and self._validate_yfinance_data(stock_data):
+                batch_data.append(stock_data)
+            elif symbol in history:
+                # Only symbols whose bars came back and proved unusable are skipped from now on;
+                # a miss in the bulk download may be transient
                 self.failed_symbols.add(symbol)
-                continue
         
         return batch_data
     
-    def _get_individual_stock_data(self, symbol: str) -> Dict[str, Any]:
-        """Get individual stock data from YFinance"""
+    def _download_history(self, symbols: List[str]) -> Optional[Dict[str, 'pd.DataFrame']]:
+        """Recent daily bars for all symbols in one yfinance request, keyed by symbol (tickers without bars left out); None if it fails"""
+        try:
+            import yfinance as yf
+            import pandas as pd
+            
+            yf_symbols = [f"{symbol}.NS" for symbol in symbols]
+            # Same window and adjustment as Ticker.history(period="7d"); 7 days to ensure we have previous day
+            df = yf.download(yf_symbols, period="7d", interval="1d", group_by='ticker',
+                             auto_adjust=True, threads=True, progress=False)
+            if df is None or df.empty:
+                return None
+            
+            history = {}
+            for symbol, yf_symbol in zip(symbols, yf_symbols):
+                if isinstance(df.columns, pd.MultiIndex):
+                    if yf_symbol not in df.columns.get_level_values(0):
+                        continue
+                    sub = df[yf_symbol]
+                else:
+                    sub = df  # single ticker: flat columns
+                # Rows are aligned across tickers, so drop the dates this one has no bar for;
+                # a ticker the download failed for comes back all-NaN and counts as missing
+                sub = sub.dropna(how='all')
+                if not sub.empty:
+                    history[symbol] = sub
+            return history
+            
+        except Exception as e:
+            logger.debug(f"⚠️ YFinance bulk download failed: {e}")
+            return None
+    
+    def _get_individual_stock_data(self, symbol: str, hist: Optional['pd.DataFrame'] = None) -> Dict[str, Any]:
+        """Get individual stock data from YFinance, using pre-downloaded daily bars when given"""
         try:
             import yfinance as yf
             
@@ -721,7 +908,8 @@ class EnhancedYFinanceClient:
             ticker = yf.Ticker(yf_symbol)
             
             # Get recent data (7 days to ensure we have previous day)
-            hist = ticker.history(period="7d", interval="1d")
+            if hist is None:
+                hist = ticker.history(period="7d", interval="1d")
             
             if hist.empty or len(hist) < 2:
                 logger.debug(f"⚠️ {symbol}: Insufficient historical data")
@@ -766,35 +954,22 @@ class EnhancedYFinanceClient:
     
     def _validate_yfinance_data(self, stock_data: Dict[str, Any]) -> bool:
         """Validate YFinance data quality"""
+        ltp = stock_data.get('ltp', 0)
+        open_price = stock_data.get('open_price', 0)
+        prev_close = stock_data.get('prev_close', 0)
+        prev_day_high = stock_data.get('prev_day_high', 0)
+        volume = stock_data.get('volume', 0)
+        
+        # Required fields are positive numbers, price in range, some volume, change at most 50%
         try:
-            # Check required fields
-            required_fields = ['ltp', 'open_price', 'prev_close', 'prev_day_high']
-            
-            for field in required_fields:
-                value = stock_data.get(field, 0)
-                if not isinstance(value, (int, float)) or value <= 0:
-                    return False
-            
-            # Price range validation
-            ltp = stock_data['ltp']
-            if not (5 <= ltp <= 100000):
-                return False
-            
-            # Volume validation
-            volume = stock_data.get('volume', 0)
-            if volume <= 0:
-                return False
-            
-            # Change validation
-            prev_close = stock_data['prev_close']
-            if prev_close > 0:
-                change_pct = abs((ltp - prev_close) / prev_close)
-                if change_pct > 0.5:  # Max 50% change
-                    return False
-            
-            return True
-            
-        except Exception:
+            return (isinstance(ltp, _NUMBER_TYPES) and ltp > 0 and
+                    isinstance(open_price, _NUMBER_TYPES) and open_price > 0 and
+                    isinstance(prev_close, _NUMBER_TYPES) and prev_close > 0 and
+                    isinstance(prev_day_high, _NUMBER_TYPES) and prev_day_high > 0 and
+                    5 <= ltp <= 100000 and
+                    volume > 0 and
+                    abs((ltp - prev_close) / prev_close) <= 0.5)
+        except TypeError:  # non-numeric volume
             return False
 
 
@@ -803,8 +978,16 @@ class NSEClient:
         self.robust_scraper = RobustNSEScraper()
         self.yfinance_client = EnhancedYFinanceClient()
         self.nse_initialized = False
-        self._init_nse_tools()
+        self._nse_tools_loaded = False
+        self._nse_tools_limiter = _RateLimiter(NSE_TOOLS_REQUEST_INTERVAL)
         
+    def _nse_tools_ready(self) -> bool:
+        """Import and initialize nsetools on first use, so clients that never fall back to it skip the import"""
+        if not self._nse_tools_loaded:
+            self._nse_tools_loaded = True
+            self._init_nse_tools()
+        return self.nse_initialized
+    
     def _init_nse_tools(self):
         """Initialize NSE tools with correct method"""
         try:
@@ -835,17 +1018,12 @@ class NSEClient:
                 return fo_stocks
             
             # Fallback to NSE tools if available
-            if self.nse_initialized:
+            if self._nse_tools_ready():
                 try:
                     logger.info("📊 Fallback: Using NSE tools...")
                     all_stocks = self.nse.get_stock_codes()
                     if all_stocks and isinstance(all_stocks, dict):
-                        known_fo_stocks = self.robust_scraper._get_comprehensive_fo_list()
-                        
-                        fo_list = []
-                        for symbol in known_fo_stocks:
-                            if symbol in all_stocks:
-                                fo_list.append(symbol)
+                        fo_list = [symbol for symbol in _COMPREHENSIVE_FO_STOCKS if symbol in all_stocks]
                         
                         if fo_list:
                             logger.info(f"✅ NSE tools fallback: {len(fo_list)} stocks")
@@ -862,12 +1040,21 @@ class NSEClient:
             logger.error(f"❌ F&O stocks fetch failed: {e}")
             return self.robust_scraper._get_comprehensive_fo_list()
     
+    def _merge_stocks(self, stock_by_symbol: Dict[str, Dict[str, Any]], stocks: List[Dict[str, Any]]) -> int:
+        """Merge fetched stocks into the symbol index; the first source to return a symbol wins"""
+        added = 0
+        for stock in stocks:
+            symbol = stock['symbol']
+            if symbol not in stock_by_symbol:
+                stock_by_symbol[symbol] = stock
+                added += 1
+        return added
+    
     def get_stock_data(self, symbols: List[str]) -> List[Dict[str, Any]]:
         """Get REAL stock data using multiple robust methods"""
         try:
-            all_stock_data = []
-            successful_symbols = []
-            failed_symbols = []
+            # Symbol-indexed results keep membership checks O(1) and drop duplicates across sources
+            stock_by_symbol = {}
             
             logger.info(f"🎯 Fetching REAL stock data for {len(symbols)} symbols...")
             
@@ -877,8 +1064,7 @@ class NSEClient:
                 nse_data = self.robust_scraper.get_stock_data_robust(symbols[:20])  # Limit for efficiency
                 
                 if nse_data:
-                    all_stock_data.extend(nse_data)
-                    successful_symbols.extend([s['symbol'] for s in nse_data])
+                    self._merge_stocks(stock_by_symbol, nse_data)
                     logger.info(f"✅ Robust NSE: {len(nse_data)} stocks")
                 else:
                     logger.warning("⚠️ Robust NSE scraper returned no data")
@@ -887,43 +1073,42 @@ class NSEClient:
                 logger.warning(f"⚠️ Robust NSE scraper failed: {e}")
             
             # Method 2: NSE Tools (if available and for missing symbols)
-            if self.nse_initialized:
-                missing_symbols = [s for s in symbols if s not in successful_symbols]
+            if self._nse_tools_ready():
+                missing_symbols = [s for s in symbols if s not in stock_by_symbol]
                 if missing_symbols:
                     try:
                         logger.info(f"📊 Method 2: NSE tools for {len(missing_symbols)} missing symbols...")
                         nse_tools_data = self._get_nse_tools_data(missing_symbols[:10])
                         
                         if nse_tools_data:
-                            all_stock_data.extend(nse_tools_data)
-                            successful_symbols.extend([s['symbol'] for s in nse_tools_data])
-                            logger.info(f"✅ NSE tools: {len(nse_tools_data)} additional stocks")
+                            added = self._merge_stocks(stock_by_symbol, nse_tools_data)
+                            logger.info(f"✅ NSE tools: {added} additional stocks")
                             
                     except Exception as e:
                         logger.warning(f"⚠️ NSE tools method failed: {e}")
             
             # Method 3: YFinance fallback (for remaining missing symbols)
-            final_missing = [s for s in symbols if s not in successful_symbols]
+            final_missing = [s for s in symbols if s not in stock_by_symbol]
             if final_missing:
                 try:
                     logger.info(f"📊 Method 3: YFinance fallback for {len(final_missing)} symbols...")
                     yf_data = self.yfinance_client.get_stock_data_batch(final_missing[:15])
                     
                     if yf_data:
-                        all_stock_data.extend(yf_data)
-                        successful_symbols.extend([s['symbol'] for s in yf_data])
-                        logger.info(f"✅ YFinance: {len(yf_data)} additional stocks")
+                        added = self._merge_stocks(stock_by_symbol, yf_data)
+                        logger.info(f"✅ YFinance: {added} additional stocks")
                         
                 except Exception as e:
                     logger.warning(f"⚠️ YFinance fallback failed: {e}")
             
             # Final summary
-            failed_symbols = [s for s in symbols if s not in successful_symbols]
+            all_stock_data = list(stock_by_symbol.values())
+            failed_symbols = [s for s in symbols if s not in stock_by_symbol]
             
             if all_stock_data:
+                successful_symbols = list(stock_by_symbol)
                 logger.info(f"✅ TOTAL SUCCESS: {len(all_stock_data)} stocks with real data")
-                if successful_symbols:
-                    logger.info(f"✅ Successful: {', '.join(successful_symbols[:5])}{'...' if len(successful_symbols) > 5 else ''}")
+                logger.info(f"✅ Successful: {', '.join(successful_symbols[:5])}{'...' if len(successful_symbols) > 5 else ''}")
             
             if failed_symbols:
                 logger.warning(f"❌ Failed to fetch: {len(failed_symbols)} stocks")
@@ -937,88 +1122,58 @@ class NSEClient:
     
     def _get_nse_tools_data(self, symbols: List[str]) -> List[Dict[str, Any]]:
         """Get data using NSE tools"""
-        nse_data = []
-        
-        for symbol in symbols:
-            try:
-                time.sleep(0.5)  # Rate limiting
+        # Each symbol is three blocking round-trips (quote, history, F&O), so fan them out over the worker pool
+        results = _WORKER_POOL.map(self._get_nse_tools_symbol, symbols)
+        return [stock_info for stock_info in results if stock_info]
+    
+    def _get_nse_tools_symbol(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Get one symbol's data using NSE tools, or None when unavailable"""
+        try:
+            self._nse_tools_limiter.wait()  # Rate limiting
+            
+            quote = self.nse.get_quote(symbol)
+            if quote and isinstance(quote, dict) and quote.get('lastPrice'):
                 
-                quote = self.nse.get_quote(symbol)
-                if quote and isinstance(quote, dict) and quote.get('lastPrice'):
-                    
-                    current_price = float(quote.get('lastPrice', 0))
-                    open_price = float(quote.get('open', 0))
-                    prev_close = float(quote.get('previousClose', 0))
-                    
-                    # Get intraday high/low
-                    intraday = quote.get('intraDayHighLow', {})
-                    day_high = float(intraday.get('max', current_price))
-                    day_low = float(intraday.get('min', current_price))
-                    
-                    volume = int(quote.get('totalTradedVolume', 0))
-                    
-                    # Try to get historical data from robust scraper
-                    hist_data = self.robust_scraper._get_historical_data_robust(symbol)
-                    
-                    stock_info = {
-                        'symbol': symbol,
-                        'open_price': open_price,
-                        'high_price': day_high,
-                        'low_price': day_low,
-                        'ltp': current_price,
-                        'prev_close': prev_close,
-                        'prev_day_high': hist_data.get('prev_day_high', prev_close),
-                        'prev_day_open': hist_data.get('prev_day_open', prev_close),
-                        'prev_day_low': hist_data.get('prev_day_low', prev_close),
-                        'volume': volume,
-                        'change_in_oi': 0,
-                        'total_oi': 0,
-                        'source': 'nsetools_real'
-                    }
-                    
-                    # Try to get F&O data
-                    fo_data = self.robust_scraper._get_fo_data_robust(symbol)
-                    if fo_data:
-                        stock_info.update(fo_data)
-                    
-                    if self._validate_real_stock_data(stock_info):
-                        nse_data.append(stock_info)
-                        logger.debug(f"✅ NSE tools: {symbol} = ₹{current_price:.2f}")
+                current_price = float(quote.get('lastPrice', 0))
+                open_price = float(quote.get('open', 0))
+                prev_close = float(quote.get('previousClose', 0))
                 
-            except Exception as e:
-                logger.debug(f"⚠️ NSE tools failed for {symbol}: {e}")
-                continue
+                # Get intraday high/low
+                intraday = quote.get('intraDayHighLow', {})
+                day_high = float(intraday.get('max', current_price))
+                day_low = float(intraday.get('min', current_price))
+                
+                volume = int(quote.get('totalTradedVolume', 0))
+                
+                # Previous-day and F&O data from the robust scraper
+                stock_info = self.robust_scraper._build_stock_data(
+                    symbol, current_price, open_price, day_high, day_low, prev_close, volume,
+                    'nsetools_real', with_fo=True
+                )
+                
+                if self._validate_real_stock_data(stock_info):
+                    logger.debug(f"✅ NSE tools: {symbol} = ₹{current_price:.2f}")
+                    return stock_info
+            
+        except Exception as e:
+            logger.debug(f"⚠️ NSE tools failed for {symbol}: {e}")
         
-        return nse_data
+        return None
     
     def _validate_real_stock_data(self, stock_info: Dict[str, Any]) -> bool:
         """Validate that we have real stock data"""
-        try:
-            required_fields = ['symbol', 'open_price', 'ltp', 'prev_close']
-            
-            for field in required_fields:
-                value = stock_info.get(field, 0)
-                if not isinstance(value, (int, float)) or value <= 0:
-                    return False
-            
-            # Additional validations
-            ltp = stock_info['ltp']
-            prev_close = stock_info['prev_close']
-            
-            # Price should be reasonable
-            if not (5 <= ltp <= 100000):
-                return False
-            
-            # Change should not be extreme
-            if prev_close > 0:
-                change_pct = abs((ltp - prev_close) / prev_close)
-                if change_pct > 0.5:  # Max 50% change
-                    return False
-            
-            return True
-            
-        except Exception:
-            return False
+        symbol = stock_info.get('symbol', 0)
+        open_price = stock_info.get('open_price', 0)
+        ltp = stock_info.get('ltp', 0)
+        prev_close = stock_info.get('prev_close', 0)
+        
+        # Required fields are positive numbers, price reasonable, change not extreme (max 50%)
+        return (isinstance(symbol, _NUMBER_TYPES) and symbol > 0 and
+                isinstance(open_price, _NUMBER_TYPES) and open_price > 0 and
+                isinstance(ltp, _NUMBER_TYPES) and ltp > 0 and
+                isinstance(prev_close, _NUMBER_TYPES) and prev_close > 0 and
+                5 <= ltp <= 100000 and
+                abs((ltp - prev_close) / prev_close) <= 0.5)
     
     def get_historical_data(self, symbol: str) -> Dict[str, Any]:
         """Get historical data using robust methods"""
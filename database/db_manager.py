@@ -6,6 +6,27 @@ import os
 
 logger = logging.getLogger(__name__)
 
+_INSERT_SIGNAL_SQL = '''
+    INSERT INTO signals (
+        symbol, open_price, ltp, prev_close, prev_day_high, 
+        percentage_change, volume, market_cap, source
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+def _signal_row(signal_data: Dict[str, Any]) -> tuple:
+    """Signal dict as a parameter tuple for _INSERT_SIGNAL_SQL"""
+    return (
+        signal_data.get('symbol', ''),
+        signal_data.get('open_price', 0),
+        signal_data.get('ltp', 0),
+        signal_data.get('prev_close', 0),
+        signal_data.get('prev_day_high', 0),
+        signal_data.get('percentage_change', 0),
+        signal_data.get('volume', 0),
+        signal_data.get('market_cap', 0),
+        signal_data.get('source', 'unknown')
+    )
+
 class DatabaseManager:
     """Simple database manager for stock signals"""
     
@@ -69,22 +90,7 @@ class DatabaseManager:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute('''
-                    INSERT INTO signals (
-                        symbol, open_price, ltp, prev_close, prev_day_high, 
-                        percentage_change, volume, market_cap, source
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    signal_data.get('symbol', ''),
-                    signal_data.get('open_price', 0),
-                    signal_data.get('ltp', 0),
-                    signal_data.get('prev_close', 0),
-                    signal_data.get('prev_day_high', 0),
-                    signal_data.get('percentage_change', 0),
-                    signal_data.get('volume', 0),
-                    signal_data.get('market_cap', 0),
-                    signal_data.get('source', 'unknown')
-                ))
+                cursor.execute(_INSERT_SIGNAL_SQL, _signal_row(signal_data))
                 
                 conn.commit()
                 return True
@@ -93,6 +99,20 @@ class DatabaseManager:
             logger.error(f"Error inserting signal: {e}")
             return False
     
+    def replace_signals(self, signals: List[Dict[str, Any]]) -> bool:
+        """Delete all signals and insert the given ones in a single transaction"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('DELETE FROM signals')
+                cursor.executemany(_INSERT_SIGNAL_SQL, map(_signal_row, signals))
+                conn.commit()
+            logger.info(f"Replaced signals in database with {len(signals)} new signals.")
+            return True
+        except Exception as e:
+            logger.error(f"Error replacing signals: {e}")
+            return False
+    
     def get_recent_signals(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Get recent signals from database"""
         try:
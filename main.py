@@ -4,16 +4,23 @@ Minimal NIFTY 50 Real Data Scraper & Telegram Bot
 Scrapes open, high, low, close, prev high, prev close, OI change% for NIFTY 50 from NSE and sends to Telegram.
 """
 import os
+import json
+import asyncio
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 from datetime import datetime
-import bs4
 import time
-import yfinance as yf
 from agents.filter_agent import FilterAgent
 import schedule
 
+try:
+    import orjson
+except ImportError:  # optional fast JSON decoder
+    orjson = None
+
 # --- CONFIG ---
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
@@ -23,9 +30,35 @@ HEADERS = {
     'Accept-Language': 'en-US,en;q=0.9',
 }
 
+# Concurrent option-chain requests per scan, and the sustained request rate (burst up to the same count)
+OPTION_CHAIN_CONCURRENCY = 10
+OPTION_CHAIN_RATE_PER_SEC = 5
+OPTION_CHAIN_MAX_ATTEMPTS = 3
+
+def _loads(content: bytes):
+    """Decode a JSON response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
 logger = logging.getLogger(__name__)
 
+def _build_session() -> requests.Session:
+    """Shared session: pooled keep-alive connections with retries on transient HTTP errors"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# Reused by every scan so NSE and Telegram connections skip the TCP/TLS handshake
+SESSION = _build_session()
+
 # --- SCRAPER ---
 def fetch_nifty50_data() -> list:
     url = "https://www.nseindia.com/api/equity-stockIndices?index=NIFTY%2050"
@@ -40,15 +73,17 @@ def fetch_nifty50_data() -> list:
         "Sec-Fetch-Mode": "cors",
         "Sec-Fetch-Des": "empty",
     }
-    session = requests.Session()
-    session.get("https://www.nseindia.com", headers=headers, timeout=10)
+    SESSION.get("https://www.nseindia.com", headers=headers, timeout=10)
     time.sleep(1)
-    r = session.get(url, headers=headers, timeout=10)
+    r = SESSION.get(url, headers=headers, timeout=10)
     stocks = []
     if r.status_code == 200:
         try:
-            data = r.json()
-            for stock in data.get("data", []):
+            data = _loads(r.content)
+            rows = data.get("data", [])
+            # Fetch option-chain OI for every symbol concurrently instead of one round-trip at a time
+            oi_by_symbol = fetch_oi_for_symbols([stock.get("symbol", "") for stock in rows])
+            for stock in rows:
                 def safe_round(val):
                     try:
                         return round(float(val), 2)
@@ -66,7 +101,7 @@ def fetch_nifty50_data() -> list:
                 oi_change = stock.get("changeinOpenInterest")
                 oi_change_pct = stock.get("pchangeinOpenInterest")
                 # Always fetch from option chain for best OI data
-                oi_opt, oi_change_opt, oi_change_pct_opt = fetch_oi_full_from_option_chain(symbol)
+                oi_opt, oi_change_opt, oi_change_pct_opt = oi_by_symbol.get(symbol, (None, None, None))
                 # Prefer option chain values if available, else fallback to stockIndices
                 oi_final = safe_round(oi_opt) if oi_opt is not None else safe_round(oi) if oi is not None else "N/A"
                 oi_change_final = safe_round(oi_change_opt) if oi_change_opt is not None else safe_round(oi_change) if oi_change is not None else "N/A"
@@ -93,23 +128,9 @@ def fetch_nifty50_data() -> list:
     logger.warning("Falling back to Yahoo Finance for NIFTY 50 data.")
     return []
 
-def fetch_oi_full_from_option_chain(symbol):
-    url = f"https://www.nseindia.com/api/option-chain-equities?symbol={symbol}"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept": "application/json, text/plain, */*",
-        "Referer": f"https://www.nseindia.com/option-chain?symbol={symbol}",
-        "Connection": "keep-alive",
-    }
-    session = requests.Session()
-    session.get("https://www.nseindia.com", headers=headers, timeout=10)
-    time.sleep(1)
-    r = session.get(url, headers=headers, timeout=10)
-    if r.status_code != 200:
-        return None, None, None
+def _sum_option_chain_oi(data: dict):
+    """Total OI, OI change and OI change % across all CE/PE strikes of an option chain"""
     try:
-        data = r.json()
         total_oi = 0
         total_oi_change = 0
         for record in data.get("records", {}).get("data", []):
@@ -128,6 +149,79 @@ def fetch_oi_full_from_option_chain(symbol):
     except Exception:
         return None, None, None
 
+class _AsyncTokenBucket:
+    """Token bucket: allows bursts of `capacity` requests, refilled at `rate` tokens per second"""
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if self._updated is not None:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._updated = loop.time()
+                self._tokens = 1.0
+            self._tokens -= 1
+
+async def _fetch_option_chain_oi_async(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                       bucket: _AsyncTokenBucket, symbol: str):
+    url = f"https://www.nseindia.com/api/option-chain-equities?symbol={symbol}"
+    headers = {"Referer": f"https://www.nseindia.com/option-chain?symbol={symbol}"}
+    async with semaphore:
+        for attempt in range(OPTION_CHAIN_MAX_ATTEMPTS):
+            await bucket.acquire()
+            try:
+                async with session.get(url, headers=headers) as r:
+                    if r.status == 429:
+                        # Throttled: back off exponentially, then retry
+                        await asyncio.sleep(0.5 * 2 ** attempt)
+                        continue
+                    if r.status != 200:
+                        return None, None, None
+                    data = _loads(await r.read())
+                    return _sum_option_chain_oi(data)
+            except Exception:
+                return None, None, None
+    return None, None, None
+
+async def _fetch_oi_for_symbols_async(symbols: list) -> dict:
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept": "application/json, text/plain, */*",
+        "Connection": "keep-alive",
+    }
+    connector = aiohttp.TCPConnector(limit_per_host=20, keepalive_timeout=60)
+    timeout = aiohttp.ClientTimeout(total=10)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+        # One homepage visit sets the cookies every option-chain request in this session reuses
+        try:
+            async with session.get("https://www.nseindia.com") as r:
+                await r.read()
+        except Exception as e:
+            logger.warning(f"NSE homepage warmup failed: {e}")
+        await asyncio.sleep(1)
+        semaphore = asyncio.Semaphore(OPTION_CHAIN_CONCURRENCY)
+        bucket = _AsyncTokenBucket(OPTION_CHAIN_RATE_PER_SEC, OPTION_CHAIN_RATE_PER_SEC)
+        results = await asyncio.gather(*(_fetch_option_chain_oi_async(session, semaphore, bucket, symbol) for symbol in symbols))
+    return dict(zip(symbols, results))
+
+def fetch_oi_for_symbols(symbols: list) -> dict:
+    """Option-chain (total OI, OI change, OI change %) for each symbol, fetched concurrently"""
+    try:
+        return asyncio.run(_fetch_oi_for_symbols_async(symbols))
+    except Exception as e:
+        logger.error(f"Option chain fetch failed: {e}")
+        return {}
+
 # --- TELEGRAM ---
 def send_telegram_message(message: str) -> bool:
     if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
@@ -146,7 +240,7 @@ def send_telegram_message(message: str) -> bool:
             'disable_web_page_preview': True
         }
         try:
-            r = requests.post(url, json=payload, timeout=10)
+            r = SESSION.post(url, json=payload, timeout=10)
             if r.status_code == 200 and r.json().get('ok'):
                 logger.info("Telegram message chunk sent.")
             else:
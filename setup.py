@@ -0,0 +1,17 @@
+"""Builds the optional Cython filter kernel in place: python setup.py build_ext --inplace"""
+import numpy as np
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+setup(
+    name='stock-scanner-filter-ext',
+    ext_modules=cythonize(
+        [Extension(
+            'agents._filter_ext',
+            ['agents/_filter_ext.pyx'],
+            include_dirs=[np.get_include()],
+            define_macros=[('NPY_NO_DEPRECATED_API', 'NPY_1_7_API_VERSION')],
+        )],
+        language_level=3,
+    ),
+)
@@ -0,0 +1,30 @@
+import unittest
+
+from agents.alert_agent import AlertAgent, TELEGRAM_MAX_MESSAGE_LENGTH
+
+
+class SplitSummaryTest(unittest.TestCase):
+    def setUp(self):
+        self.agent = AlertAgent()
+
+    def test_short_summary_is_one_message(self):
+        self.assertEqual(self.agent._split_summary(["header\n", "1. ABC\n", "footer"]), ["header\n1. ABC\nfooter"])
+
+    def test_long_summary_splits_into_parts_that_fit(self):
+        blocks = ["header\n"] + [f"{i}. {'x' * 1500}\n" for i in range(10)] + ["footer"]
+        messages = self.agent._split_summary(blocks)
+        self.assertGreater(len(messages), 2)
+        self.assertTrue(all(len(message) <= TELEGRAM_MAX_MESSAGE_LENGTH for message in messages))
+        self.assertEqual("".join(messages), "".join(blocks))
+        # Splits fall on block boundaries
+        self.assertTrue(all(message.startswith(("header", "2.", "4.", "6.", "8.")) for message in messages))
+
+    def test_oversized_block_is_cut(self):
+        blocks = ["header\n", "y" * (TELEGRAM_MAX_MESSAGE_LENGTH * 2 + 10), "footer"]
+        messages = self.agent._split_summary(blocks)
+        self.assertTrue(all(len(message) <= TELEGRAM_MAX_MESSAGE_LENGTH for message in messages))
+        self.assertEqual("".join(messages), "".join(blocks))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+
+from agents.filter_agent import FilterAgent
+
+
+class FilterBuySellSignalsTest(unittest.TestCase):
+    def setUp(self):
+        self.agent = FilterAgent()
+
+    def test_blank_prev_high_counts_as_zero(self):
+        # main.py passes "" when NSE omits previousHigh/previousLow
+        stocks = [{'symbol': 'ABC', 'open': 100.0, 'prev_high': '', 'prev_low': '', 'oi_change_pct': '8%'}]
+        signals = self.agent.filter_buy_sell_signals(stocks)
+        self.assertEqual([s['signal'] for s in signals], ['BUY'])
+
+    def test_missing_open_counts_as_zero(self):
+        stocks = [{'symbol': 'ABC', 'prev_high': 110.0, 'prev_low': 95.0, 'oi_change_pct': 9.5}]
+        signals = self.agent.filter_buy_sell_signals(stocks)
+        self.assertEqual([s['signal'] for s in signals], ['SELL'])
+
+
+if __name__ == '__main__':
+    unittest.main()
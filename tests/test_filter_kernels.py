@@ -0,0 +1,72 @@
+import unittest
+
+import numpy as np
+
+from agents._filter_kernels import _evaluate_loop, _evaluate_numpy
+from agents.filter_agent import FilterAgent
+
+try:
+    from agents import _filter_ext
+except ImportError:  # compiled extension is optional
+    _filter_ext = None
+
+
+def _random_columns(n, seed=0):
+    """Filter columns with zero and NaN prev_day_high/volume mixed in"""
+    rng = np.random.default_rng(seed)
+    open_price = rng.uniform(5, 200, n)
+    ltp = open_price * rng.uniform(0.9, 1.2, n)
+    prev_close = open_price * rng.uniform(0.8, 1.05, n)
+    prev_day_high = prev_close * rng.uniform(0.9, 1.1, n)
+    prev_day_high[rng.random(n) < 0.1] = 0.0
+    prev_day_high[rng.random(n) < 0.1] = np.nan
+    volume = rng.choice([0.0, 500.0, 5000.0, 60000.0, 200000.0, np.nan], n)
+    total_oi = rng.choice([0.0, 100.0], n)
+    return open_price, ltp, prev_close, prev_day_high, volume, total_oi
+
+
+class EvaluateParityTest(unittest.TestCase):
+    def assert_results_equal(self, expected, actual):
+        for want, got in zip(expected, actual):
+            np.testing.assert_array_equal(np.asarray(want), np.asarray(got))
+
+    def test_loop_matches_numpy(self):
+        columns = _random_columns(2000)
+        self.assert_results_equal(_evaluate_numpy(*columns, 7.0), _evaluate_loop(*columns, 7.0))
+
+    def test_nan_rows_never_pass(self):
+        columns = _random_columns(2000, seed=1)
+        mask = _evaluate_numpy(*columns, 2.0)[0]
+        self.assertTrue(mask.any())
+        self.assertFalse((mask & (np.isnan(columns[3]) | np.isnan(columns[4]))).any())
+
+
+@unittest.skipIf(_filter_ext is None, "Cython extension not built (python setup.py build_ext --inplace)")
+class FilterExtParityTest(unittest.TestCase):
+    def test_matches_numpy(self):
+        rows = [
+            {'open_price': 105.0, 'ltp': 110.0, 'prev_close': 100.0, 'prev_day_high': 101.0, 'volume': 5000, 'total_oi': 100},
+            {'open_price': 105.0, 'ltp': 110.0, 'prev_close': 100.0, 'prev_day_high': None, 'volume': 5000},
+            {'open_price': 105.0, 'ltp': 110.0, 'prev_close': 100.0, 'prev_day_high': 'abc', 'volume': '60000'},
+            {'open_price': 105.0, 'ltp': 110.0, 'prev_close': 100.0, 'volume': 200000},
+            {'open_price': 105.0, 'ltp': 110.0, 'prev_close': 100.0, 'prev_day_high': 0, 'volume': ''},
+        ]
+        rows += [dict(zip(('open_price', 'ltp', 'prev_close', 'prev_day_high', 'volume', 'total_oi'), values))
+                 for values in zip(*(column.tolist() for column in _random_columns(500, seed=2)))]
+
+        cols, results = _filter_ext.filter_batch(rows, 7.0)
+        expected_cols = FilterAgent()._to_soa(rows)
+        for field, column in expected_cols.items():
+            np.testing.assert_array_equal(cols[field], column)
+        expected = _evaluate_numpy(*(expected_cols[field] for field in
+                                     ('open_price', 'ltp', 'prev_close', 'prev_day_high', 'volume', 'total_oi')), 7.0)
+        for want, got in zip(expected, results):
+            np.testing.assert_array_equal(want, got)
+
+    def test_rejects_non_dict_rows(self):
+        with self.assertRaises(TypeError):
+            _filter_ext.filter_batch([{'open_price': 1.0}, None], 7.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
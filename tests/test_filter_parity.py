@@ -0,0 +1,176 @@
+"""filter_stocks and filter_buy_sell_signals against straight ports of the original per-row loops"""
+import random
+import unittest
+
+from agents.filter_agent import FilterAgent
+
+MIN_PCT = 7.0
+
+
+def _baseline_quality(stock):
+    try:
+        score = 0
+        source = stock.get('source', '').lower()
+        if 'nse' in source:
+            score += 3
+        elif 'yfinance' in source:
+            score += 2
+        else:
+            score += 1
+        if stock.get('prev_day_high', 0) > 0:
+            score += 2
+        if stock.get('volume', 0) > 1000:
+            score += 1
+        if stock.get('total_oi', 0) > 0:
+            score += 2
+        if 'real' in source:
+            score += 2
+        return "EXCELLENT" if score >= 8 else "GOOD" if score >= 6 else "FAIR" if score >= 4 else "POOR"
+    except Exception:
+        return "UNKNOWN"
+
+
+def _baseline_valid(stock):
+    try:
+        for field in ('symbol', 'open_price', 'ltp', 'prev_close'):
+            value = stock.get(field, 0)
+            if not isinstance(value, (int, float)) or value <= 0:
+                return False
+        source = stock.get('source', '').lower()
+        if 'synthetic' in source or 'fake' in source or 'generated' in source:
+            return False
+        ltp, prev_close = stock['ltp'], stock['prev_close']
+        return 5 <= ltp <= 100000 and 5 <= prev_close <= 100000 and 0.3 <= ltp / prev_close <= 3.0
+    except Exception:
+        return False
+
+
+def _baseline_filter_stocks(stock_data):
+    passed = []
+    for stock in filter(_baseline_valid, stock_data):
+        try:
+            open_price = float(stock.get('open_price', 0))
+            ltp = float(stock.get('ltp', 0))
+            prev_close = float(stock.get('prev_close', 0))
+            prev_day_high = float(stock.get('prev_day_high', 0))
+            volume = int(stock.get('volume', 0))
+        except Exception:
+            continue
+        if prev_day_high <= 0:
+            prev_day_high = prev_close
+        gap_up = (open_price - prev_day_high) / prev_day_high * 100
+        change = (ltp - prev_close) / prev_close * 100
+        if (open_price > prev_day_high and change >= MIN_PCT and volume > 1000 and 10 <= ltp <= 50000 and
+                0.1 <= gap_up <= 25 and -50 <= change <= 100):
+            day_change = ltp - open_price
+            passed.append((stock['symbol'], round(change, 2), round(gap_up, 2), round(day_change, 2),
+                           round(day_change / open_price * 100, 2), _baseline_quality(stock)))
+    return passed
+
+
+def _baseline_buy_sell(stock_data):
+    def safe_float(value):
+        try:
+            return float(value)
+        except Exception:
+            return 0.0
+    signals = []
+    for stock in stock_data:
+        open_price = safe_float(stock.get('open', 0))
+        oi_change_pct = safe_float(str(stock.get('oi_change_pct', 'N/A')).replace('%', ''))
+        if open_price > safe_float(stock.get('prev_high', 0)) and oi_change_pct > 7:
+            signals.append((stock['symbol'], 'BUY'))
+        elif open_price < safe_float(stock.get('prev_low', 0)) and oi_change_pct > 7:
+            signals.append((stock['symbol'], 'SELL'))
+    return signals
+
+
+def _stock(symbol, **fields):
+    stock = {'symbol': symbol, 'open_price': 105.0, 'ltp': 110.0, 'prev_close': 100.0, 'prev_day_high': 101.0,
+             'volume': 5000, 'total_oi': 100, 'source': 'nse_real'}
+    stock.update(fields)
+    return {key: value for key, value in stock.items() if value is not _MISSING}
+
+
+_MISSING = object()
+
+REPRESENTATIVE_ROWS = [
+    _stock(1),
+    _stock(2, prev_day_high=_MISSING),
+    _stock(3, prev_day_high=None),
+    _stock(4, prev_day_high='abc'),
+    _stock(5, prev_day_high=''),
+    _stock(6, prev_day_high='101.5'),
+    _stock(7, prev_day_high=0),
+    _stock(8, volume='60000'),
+    _stock(9, volume=None),
+    _stock(10, volume=_MISSING),
+    _stock(11, volume='abc'),
+    _stock(12, total_oi=_MISSING, source='yfinance_real'),
+    _stock(13, total_oi='n/a', source='NSE live'),
+    _stock(14, source='synthetic_feed'),
+    _stock(15, open_price='105'),
+    _stock(16, ltp=_MISSING),
+    _stock('ABC'),
+    _stock(17, open_price=99.0),
+    _stock(18, ltp=103.0),
+    _stock(19, source=_MISSING),
+]
+
+
+def _random_rows(n, seed):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        prev_close = rng.uniform(5, 3000)
+        stock = _stock(100 + i, prev_close=prev_close, open_price=prev_close * rng.uniform(1.0, 1.2),
+                       ltp=prev_close * rng.uniform(1.0, 1.3),
+                       prev_day_high=rng.choice([0, prev_close * rng.uniform(0.95, 1.05), None, 'abc', _MISSING]),
+                       volume=rng.choice([0, 500, 5000, 60000, 200000, '5000', None, _MISSING]),
+                       total_oi=rng.choice([0, 100, _MISSING]),
+                       source=rng.choice(['nse_real', 'yfinance_real', 'nsetools', 'other', 'synthetic']))
+        rows.append(stock)
+    return rows
+
+
+class FilterStocksParityTest(unittest.TestCase):
+    def assert_matches_baseline(self, rows):
+        agent = FilterAgent()
+        agent.min_percentage_increase = MIN_PCT
+        result = [(s['symbol'], s['percentage_change'], s['gap_up_percentage'], s['day_change'],
+                   s['day_change_percentage'], s['data_quality']) for s in agent.filter_stocks(rows)]
+        self.assertEqual(result, _baseline_filter_stocks(rows))
+
+    def test_representative_rows(self):
+        self.assert_matches_baseline(REPRESENTATIVE_ROWS)
+
+    def test_random_rows(self):
+        for seed in range(3):
+            self.assert_matches_baseline(_random_rows(1000, seed))
+
+
+class FilterBuySellParityTest(unittest.TestCase):
+    def test_representative_rows(self):
+        rows = [
+            {'symbol': 'A', 'open': 105.0, 'prev_high': 100.0, 'prev_low': 95.0, 'oi_change_pct': '8%'},
+            {'symbol': 'B', 'open': 90.0, 'prev_high': 100.0, 'prev_low': 95.0, 'oi_change_pct': 9.5},
+            {'symbol': 'C', 'open': 105.0, 'prev_high': '', 'prev_low': '', 'oi_change_pct': '7.5'},
+            {'symbol': 'D', 'prev_high': 100.0, 'prev_low': 95.0, 'oi_change_pct': 12},
+            {'symbol': 'E', 'open': 'abc', 'prev_high': 100.0, 'prev_low': 95.0, 'oi_change_pct': '8%'},
+            {'symbol': 'F', 'open': 105.0, 'prev_high': 100.0, 'prev_low': 95.0, 'oi_change_pct': 'N/A'},
+            {'symbol': 'G', 'open': 105.0, 'prev_high': 100.0, 'prev_low': 95.0},
+            {'symbol': 'H', 'open': 105.0, 'prev_high': None, 'prev_low': 95.0, 'oi_change_pct': None},
+            {'symbol': 'I', 'open': '96', 'prev_high': '100', 'prev_low': '97', 'oi_change_pct': '-', },
+            {'symbol': 'J', 'open': 97.0, 'prev_high': 100.0, 'prev_low': 95.0, 'oi_change_pct': '20%'},
+        ]
+        rng = random.Random(0)
+        rows += [{'symbol': f'R{i}', 'open': rng.choice([rng.uniform(90, 110), '', None, '101']),
+                  'prev_high': rng.choice([100, '', '100']), 'prev_low': rng.choice([95, '', None]),
+                  'oi_change_pct': rng.choice(['8%', 'N/A', '3.2%', 9.5, None, '-'])} for i in range(300)]
+
+        signals = FilterAgent().filter_buy_sell_signals(rows)
+        self.assertEqual([(s['symbol'], s['signal']) for s in signals], _baseline_buy_sell(rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
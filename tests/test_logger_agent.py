@@ -0,0 +1,39 @@
+import dataclasses
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from agents.logger_agent import LoggerAgent
+from config.settings import settings
+
+
+def _signal(symbol, oi_change_pct):
+    return {'symbol': symbol, 'open': 105.0, 'close': 110.0, 'prev_close': 100.0, 'prev_high': 101.0,
+            'oi_change_pct': oi_change_pct, 'volume': 5000, 'source': 'nse'}
+
+
+class LogSignalsTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        test_settings = dataclasses.replace(settings, DATABASE_PATH=os.path.join(tmp.name, 'signals.db'))
+        with mock.patch('agents.logger_agent.settings', test_settings):
+            self.agent = LoggerAgent()
+
+    def test_replaces_previous_signals(self):
+        self.agent.log_signals([_signal('ABC', 9.0), _signal('XYZ', 12.0)])
+        summary = self.agent.log_signals([_signal('DEF', 8.0)])
+        self.assertEqual(summary['successfully_logged'], 1)
+        self.assertEqual(self.agent.db_manager.get_signal_count(), 1)
+
+    def test_all_invalid_batch_keeps_previous_signals(self):
+        self.agent.log_signals([_signal('ABC', 9.0)])
+        summary = self.agent.log_signals([_signal('XYZ', 1.0), _signal('', 9.0)])
+        self.assertEqual(summary['successfully_logged'], 0)
+        self.assertEqual(summary['failed'], 2)
+        self.assertEqual(self.agent.db_manager.get_signal_count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()